@@ -8,11 +8,16 @@ Keeps original structure, fonts, tables, styles - only removes images and replac
 import re
 import os
 import sys
+import logging
 from pathlib import Path
 import zipfile
 import tempfile
 from xml.etree import ElementTree as ET
 import hashlib
+import functools
+import bisect
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from docx import Document
@@ -28,10 +33,263 @@ try:
 except ImportError:
     HTML_AVAILABLE = False
 
+logger = logging.getLogger(__name__)
+
+try:
+    from lxml import etree
+
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# BeautifulSoup's lxml tree builder parses far faster than the pure-Python html.parser. Its tree
+# is normalized the way libxml2 builds it: whitespace between the DOCTYPE and <html> collapses
+# to one newline, and a body-less fragment is wrapped in <html><body>, so its text gets keyword
+# replacement too (with html.parser, process_html_file finds no body and leaves fragments as-is)
+HTML_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import re2
+
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+try:
+    from rapidfuzz.distance import Indel
+
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W15_NS = 'http://schemas.microsoft.com/office/word/2012/wordml'
+NSMAP = {'w': W_NS, 'w15': W15_NS}
+A_NS = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+W14_NS = 'http://schemas.microsoft.com/office/word/2010/wordml'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+V_NS = 'urn:schemas-microsoft-com:vml'
+O_NS = 'urn:schemas-microsoft-com:office:office'
+REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+# Fully-qualified tag names, so element checks are set lookups instead of substring scans
+W_BODY = f'{{{W_NS}}}body'
+W_P = f'{{{W_NS}}}p'
+W_P_PR = f'{{{W_NS}}}pPr'
+W_P_STYLE = f'{{{W_NS}}}pStyle'
+W_R = f'{{{W_NS}}}r'
+W_R_PR = f'{{{W_NS}}}rPr'
+W_R_STYLE = f'{{{W_NS}}}rStyle'
+W_HYPERLINK = f'{{{W_NS}}}hyperlink'
+W_T = f'{{{W_NS}}}t'
+W_SDT = f'{{{W_NS}}}sdt'
+W_SDT_PR = f'{{{W_NS}}}sdtPr'
+W_TAB = f'{{{W_NS}}}tab'
+W_PTAB = f'{{{W_NS}}}ptab'
+W_BR = f'{{{W_NS}}}br'
+W_CR = f'{{{W_NS}}}cr'
+W_NO_BREAK_HYPHEN = f'{{{W_NS}}}noBreakHyphen'
+W_TBL = f'{{{W_NS}}}tbl'
+W_TR = f'{{{W_NS}}}tr'
+W_TR_PR = f'{{{W_NS}}}trPr'
+W_GRID_BEFORE = f'{{{W_NS}}}gridBefore'
+W_TC = f'{{{W_NS}}}tc'
+W_TC_PR = f'{{{W_NS}}}tcPr'
+W_GRID_SPAN = f'{{{W_NS}}}gridSpan'
+W_V_MERGE = f'{{{W_NS}}}vMerge'
+W_R_FONTS = f'{{{W_NS}}}rFonts'
+W_SZ = f'{{{W_NS}}}sz'
+W_U = f'{{{W_NS}}}u'
+W_COLOR = f'{{{W_NS}}}color'
+W_B = f'{{{W_NS}}}b'
+W_I = f'{{{W_NS}}}i'
+W_STYLE = f'{{{W_NS}}}style'
+W_NAME = f'{{{W_NS}}}name'
+W_VAL = f'{{{W_NS}}}val'
+W_TYPE = f'{{{W_NS}}}type'
+W_ASCII = f'{{{W_NS}}}ascii'
+W_H_ANSI = f'{{{W_NS}}}hAnsi'
+W_STYLE_ID = f'{{{W_NS}}}styleId'
+W_DEFAULT = f'{{{W_NS}}}default'
+W_DRAWING = f'{{{W_NS}}}drawing'
+W_OBJECT = f'{{{W_NS}}}object'
+W_PICT = f'{{{W_NS}}}pict'
+A_BLIP = f'{{{A_NS}}}blip'
+A_SRGB_CLR = f'{{{A_NS}}}srgbClr'
+V_IMAGEDATA = f'{{{V_NS}}}imagedata'
+W_SHD = f'{{{W_NS}}}shd'
+W_HIGHLIGHT = f'{{{W_NS}}}highlight'
+W_P_BDR = f'{{{W_NS}}}pBdr'
+W_BDR = f'{{{W_NS}}}bdr'
+W_THEME_COLOR = f'{{{W_NS}}}themeColor'
+W_THEME_TINT = f'{{{W_NS}}}themeTint'
+W_THEME_SHADE = f'{{{W_NS}}}themeShade'
+W_THEME_FILL = f'{{{W_NS}}}themeFill'
+W_APPEARANCE = f'{{{W_NS}}}appearance'
+W_SHOWING_PLC_HDR = f'{{{W_NS}}}showingPlcHdr'
+W_SDT_CONTENT = f'{{{W_NS}}}sdtContent'
+W15_APPEARANCE = f'{{{W15_NS}}}appearance'
+R_EMBED = f'{{{R_NS}}}embed'
+R_ID = f'{{{R_NS}}}id'
+DRAWING_TAGS = frozenset({W_DRAWING, W_OBJECT})
+IMAGE_TAGS = DRAWING_TAGS | {W_PICT}
+SHADING_TAGS = frozenset({W_SHD, f'{{{W_NS}}}background',
+                          f'{{{W14_NS}}}solidFill', f'{{{W14_NS}}}gradFill', f'{{{W14_NS}}}noFill'})
+THEME_TAGS = frozenset({f'{{{A_NS}}}theme', f'{{{A_NS}}}clrScheme', f'{{{A_NS}}}fontScheme',
+                        f'{{{W_NS}}}themeFontLang'})
+# Run properties standardize_run_formatting always strips
+RUN_HIGHLIGHT_TAGS = frozenset({W_HIGHLIGHT, W_SHD})
+# Content control appearance (Word 2013+ writes the w15 one)
+APPEARANCE_TAGS = frozenset({W_APPEARANCE, W15_APPEARANCE})
+# Style properties a content control carries in its w:sdtPr
+STYLE_PR_TAGS = frozenset({W_R_PR, W_P_PR})
+# Everything _sanitize_document_xml strips: shading, highlights, borders and embedded theme parts
+SANITIZE_TAGS = SHADING_TAGS | THEME_TAGS | {W_HIGHLIGHT, W_P_BDR, W_BDR}
+THEME_COLOR_ATTRS = (W_THEME_COLOR, W_THEME_TINT, W_THEME_SHADE)
+# Attributes of the explicit black w:color the cleanup passes write
+BLACK_COLOR_ATTRIB = {W_VAL: '000000'}
+# Attributes of the w:appearance / w:showingPlcHdr the content-control passes write
+HIDDEN_APPEARANCE_ATTRIB = {W_VAL: 'hidden'}
+NO_PLACEHOLDER_ATTRIB = {W_VAL: '0'}
+
+# Text equivalents of run content elements, matching python-docx's Run.text
+RUN_TEXT_TAGS = {W_TAB: '\t', W_PTAB: '\t', W_CR: '\n', W_NO_BREAK_HYPHEN: '-'}
+
+# Built-in styles whose UI name differs from the name stored in styles.xml
+UI_STYLE_NAMES = {
+    'caption': 'Caption', 'footer': 'Footer', 'header': 'Header',
+    'heading 1': 'Heading 1', 'heading 2': 'Heading 2', 'heading 3': 'Heading 3',
+    'heading 4': 'Heading 4', 'heading 5': 'Heading 5', 'heading 6': 'Heading 6',
+    'heading 7': 'Heading 7', 'heading 8': 'Heading 8', 'heading 9': 'Heading 9',
+}
+
+# Errors the best-effort XML cleanup helpers expect from odd documents (missing parts, detached nodes)
+XML_EDIT_ERRORS = (AttributeError, LookupError, TypeError, ValueError)
+
+# Media files are read and hashed on a small thread pool (file reads and sha256 release the GIL)
+MEDIA_HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+# Run texts repeat heavily in styled documents; short ones are memoized per blinder
+REPLACEMENT_CACHE_SIZE = 4096
+REPLACEMENT_CACHE_MAX_TEXT = 512
+
+# Progress lines are printed about this many times per collection (paragraphs at most every
+# PROGRESS_MIN_STEP), so large documents do not spend their time writing to stdout
+PROGRESS_UPDATES = 20
+PROGRESS_MIN_STEP = 10
+
+# CSS background images stripped from inline styles and <style> blocks
+BACKGROUND_IMAGE_CSS = re.compile(r'background-image\s*:[^;]*;?', re.IGNORECASE)
+
+# An explicit w:color value (RRGGBB); python-docx rejects anything else
+HEX_COLOR = re.compile(r'[0-9A-Fa-f]{6}')
+
+# Numbered or named backreferences inside a keyword regex
+BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+
+# Joins the w:t texts of a part for one prefilter scan; XML 1.0 text cannot contain it
+TEXT_NODE_SEPARATOR = '\x1e'
+# Regex constructs that can behave differently at the separator than at the end of a node's text
+TEXT_BOUNDARY_SENSITIVE = re.compile(r'\^|\$|\\[ABZ]|\(\?<?!')
+
+# Intermediate DOCX packages are kept in memory up to this size before spilling to disk
+SPOOL_MAX_SIZE = 64 << 20
+
+# Package parts whose format is already compressed (images, embedded Office files); deflating
+# them again costs CPU in proportion to their size and saves next to nothing, so they are stored
+PRECOMPRESSED_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg', '.jpe', '.gif', '.wdp', '.hdp',
+                                      '.mp3', '.mp4', '.m4a', '.zip', '.docx', '.xlsx', '.pptx'})
+
+
+class _TagMatcher(dict):
+    """Case-insensitive substring test of element tags (or attribute names), memoized per qualified name"""
+
+    def __init__(self, *words, match=any):
+        super().__init__()
+        self.words = words
+        self.match = match
+
+    def __missing__(self, tag):
+        # Only the first sighting of each tag pays for the lowercase copy and substring scan
+        tag_lower = str(tag).lower()
+        matched = self[tag] = self.match(word in tag_lower for word in self.words)
+        return matched
+
+
+# Loose tag families the cleanup passes strip; index with element.tag
+BORDER_TAG_MATCH = _TagMatcher('bdr', 'border')
+SHD_TAG_MATCH = _TagMatcher('shd')
+COLOR_SHD_TAG_MATCH = _TagMatcher('color', 'shd')
+COLOR_HIGHLIGHT_TAG_MATCH = _TagMatcher('color', 'highlight')
+SDT_STYLING_TAG_MATCH = _TagMatcher('rpr', 'ppr', 'color', 'shd', 'fill', 'background', 'bdr', 'border')
+# Theme color attributes (themeColor and friends); index with the attribute name
+THEME_COLOR_ATTR_MATCH = _TagMatcher('theme', 'color', match=all)
+
+
+def _overlaps(a, b):
+    """True if a and b can share characters in a text without either containing the other"""
+    return any(b.startswith(a[i:]) for i in range(1, len(a))) or any(a.startswith(b[i:]) for i in range(1, len(b)))
+
+
+def _literal_conflict(earlier, later):
+    """True if a single scan for both literal keywords could differ from replacing earlier, then later
+
+    Both are (lowercased keyword, lowercased replacement). A later keyword must not be able to
+    match the text the earlier one writes, nor overlap or contain an earlier keyword's matches;
+    an earlier keyword containing the later one is fine, because it is tried first at each position.
+    """
+    key, replacement = earlier
+    other = later[0]
+    return (other in replacement or replacement in other or _overlaps(other, replacement)
+            or (key != other and key in other) or _overlaps(key, other))
+
+
+EMPTY_FORMATTING = {
+    'font_name': None,
+    'font_size': None,
+    'font_color': None,
+    'is_bold': False,
+    'is_italic': False
+}
+
+if LXML_AVAILABLE:
+    # Package parts are parsed from the raw zip bytes with one shared parser: no ID bookkeeping,
+    # no entity expansion or network access, and no libxml2 size limits on very large documents
+    DOCX_PARSER_OPTIONS = dict(huge_tree=True, collect_ids=False, resolve_entities=False, no_network=True)
+    DOCX_PARSER = etree.XMLParser(**DOCX_PARSER_OPTIONS)
+
+    # XPath expressions are compiled once here instead of being re-parsed on every call
+    FIND_SDT = etree.XPath('.//w:sdt', namespaces=NSMAP)
+    FIND_SDT_PR = etree.XPath('.//w:sdtPr', namespaces=NSMAP)
+    FIND_HYPERLINKS = etree.XPath('.//w:hyperlink', namespaces=NSMAP)
+    FIND_NUM_PR = etree.XPath('.//w:pPr/w:numPr', namespaces=NSMAP)
+    # Whether _clean_paragraph has anything to do: a hyperlink to unwrap, or a direct run that
+    # still lacks rPr or carries an underline (or, when forcing black, a color)
+    NEEDS_CLEAN = etree.XPath(
+        'boolean(.//w:hyperlink | ./w:r[not(w:rPr) or w:rPr/w:u])', namespaces=NSMAP)
+    NEEDS_CLEAN_COLOR = etree.XPath(
+        'boolean(.//w:hyperlink | ./w:r[not(w:rPr) or w:rPr/w:u or w:rPr/w:color])', namespaces=NSMAP)
+    # Theme colour definitions: every one in the part, or only the colour scheme's own slots
+    FIND_THEME_COLORS = etree.XPath('//a:srgbClr | //a:sysClr', namespaces={'a': A_NS})
+    FIND_SCHEME_COLORS = etree.XPath(
+        '//a:clrScheme/*/a:srgbClr | //a:clrScheme/*/a:sysClr', namespaces={'a': A_NS})
+    # Every node remove_document_themes touches, in document order, from one libxml2 traversal
+    FIND_THEME_REFS = etree.XPath(
+        './/w:color[@w:themeColor] | .//w:shd[@w:themeFill] | .//*[@w:themeTint or @w:themeShade]'
+        ' | .//a:theme | .//a:clrScheme | .//a:fontScheme | .//w:themeFontLang',
+        namespaces={'w': W_NS, 'a': A_NS})
+
 
 class FileBlinder:
     def __init__(self, keyword_replacements=None, image_hashes_to_remove=None, standardize_formatting=True,
-                 font_name="Calibri", font_size=11, font_color_black=True, grey_shading=False):
+                 font_name="Calibri", font_size=11, font_color_black=True, grey_shading=False, verbose=False):
         """
         Initialize with keyword replacement dictionary and formatting options
 
@@ -42,7 +300,16 @@ class FileBlinder:
             font_size (int): Font size to use (None to keep original)
             font_color_black (bool): Whether to make all text black
             grey_shading (bool): Whether to add grey shading to text
+            verbose (bool): Whether this blinder logs per-element debug tracing. The trace goes to
+                this module's logger at DEBUG level, so the application's logging setup decides
+                whether and where it is shown.
+
+        Keys starting with \\b or [ are regular expressions; all other keys are literal text and are
+        matched case-insensitively. Keywords are applied one after another in dict order, each one
+        seeing the text the previous ones produced.
         """
+        self._debug = verbose
+
         self.image_hashes_to_remove = set(image_hashes_to_remove or [])
         self.keyword_replacements = keyword_replacements or {
             "confidential": "[REDACTED]",
@@ -56,17 +323,114 @@ class FileBlinder:
             r'\b\d{3}-\d{2}-\d{4}\b': '[SSN]',
         }
 
+        # Compile keyword patterns once so the per-run replacement loop only does matching.
+        # Keywords become an ordered list of steps, so a regex listed before a literal still sees
+        # the text the literal would have rewritten. Consecutive literal keywords that cannot affect
+        # each other's matches share a single alternation (one scan per text for all of them);
+        # literals without letters use plain str.replace; regex keywords, and replacements that use
+        # backslash escapes, keep their own pattern, with each run of them behind one prefilter.
+        self._keyword_steps = []
+        literals = []
+        regexes = []
+        keyword_sources = []
+        regex_sources = []
+        for original, replacement in self.keyword_replacements.items():
+            if original.startswith(r'\b') or original.startswith(r'['):
+                pattern = re.compile(original, re.IGNORECASE)
+            elif '\\' in replacement:
+                pattern = re.compile(re.escape(original), re.IGNORECASE)
+            else:
+                pattern = None
+                if original:
+                    keyword_sources.append(re.escape(original))
+
+            if pattern is not None:
+                if literals:
+                    self._keyword_steps.append(self._literal_step(literals))
+                    literals = []
+                regexes.append((pattern, replacement))
+                regex_sources.append(pattern.pattern)
+                continue
+
+            if regexes:
+                self._keyword_steps.append(self._regex_step(regexes))
+                regexes = []
+            if original and original.lower() == original.upper():
+                # No cased characters, so ignoring case changes nothing
+                if literals:
+                    self._keyword_steps.append(self._literal_step(literals))
+                    literals = []
+                self._keyword_steps.append(('exact', (original, replacement)))
+                continue
+
+            keyword = (original.lower(), replacement.lower())
+            if any(_literal_conflict((earlier.lower(), earlier_replacement.lower()), keyword)
+                   for earlier, earlier_replacement in literals):
+                self._keyword_steps.append(self._literal_step(literals))
+                literals = []
+            literals.append((original, replacement))
+
+        if literals:
+            self._keyword_steps.append(self._literal_step(literals))
+        if regexes:
+            self._keyword_steps.append(self._regex_step(regexes))
+
+        # Most texts contain none of the keywords, and one search over an alternation of all of
+        # them returns those texts untouched before any replacement scan (or the lowercasing the
+        # automaton needs) is done; when it finds nothing, no step can change the text. Patterns
+        # with backreferences would be renumbered inside the alternation, so they disable it.
+        self._keyword_prefilter = None
+        keyword_sources += regex_sources
+        if len(keyword_sources) > 1 and not any(BACKREFERENCE.search(source) for source in regex_sources):
+            try:
+                self._keyword_prefilter = re.compile(
+                    '|'.join(f'(?:{source})' for source in keyword_sources), re.IGNORECASE)
+            except re.error:
+                pass
+
+        # The keyword prefilter also runs over a whole part's text at once (see
+        # _replace_in_text_elements), unless a regex keyword anchors on where a text ends
+        self._joined_prefilter = None
+        if not any(TEXT_BOUNDARY_SENSITIVE.search(source) for source in regex_sources):
+            self._joined_prefilter = self._keyword_prefilter
+
+        self._cached_replacements = functools.lru_cache(maxsize=REPLACEMENT_CACHE_SIZE)(self._replace_and_count)
+
         self.standardize_formatting = standardize_formatting
         self.font_name = font_name
         self.font_size = font_size
         self.font_color_black = font_color_black
         self.grey_shading = grey_shading
 
+        # Run formatting is fixed for the lifetime of the blinder, so the w:sz value is worked out once
+        self._run_sz_val = str(int(font_size * 2)) if font_size else None
+
     def calculate_image_hash(self, image_data):
         """Calculate SHA256 hash of image data"""
         import hashlib
         return hashlib.sha256(image_data).hexdigest()
 
+    def _hash_media_files(self, media_dir):
+        """Hash every file in a media directory; returns (path, hash, error) tuples in directory order"""
+        return self._hash_media([f for f in media_dir.iterdir() if f.is_file()], Path.read_bytes)
+
+    def _hash_media_parts(self, zip_in, names):
+        """Hash media parts straight out of an open package; returns (name, hash, error) tuples in order"""
+        return self._hash_media(names, zip_in.read)
+
+    def _hash_media(self, items, read):
+        """Hash read(item) for every item on the media thread pool; returns (item, hash, error) tuples"""
+        def hash_item(item):
+            try:
+                return item, self.calculate_image_hash(read(item)), None
+            except Exception as e:
+                return item, None, e
+
+        if len(items) < 2:
+            return [hash_item(item) for item in items]
+        with ThreadPoolExecutor(max_workers=MEDIA_HASH_WORKERS) as executor:
+            return list(executor.map(hash_item, items))
+
     def should_remove_image(self, image_data):
         """Check if an image should be removed based on its hash"""
         if not self.image_hashes_to_remove:
@@ -88,11 +452,10 @@ class FileBlinder:
             raise ValueError(f"Unsupported file type: {extension}")
 
     def _extract_docx_structure(self, input_path):
-        """Extract structure from DOCX file"""
-        if not DOCX_AVAILABLE:
-            raise ImportError("python-docx not installed")
+        """Extract structure from DOCX file by streaming word/document.xml"""
+        if not LXML_AVAILABLE:
+            raise ImportError("lxml not installed. Run: pip install lxml")
 
-        doc = Document(input_path)
         structure = {
             'type': 'docx',
             'paragraphs': [],
@@ -100,101 +463,186 @@ class FileBlinder:
             'tables': []
         }
 
-        # Extract paragraphs with metadata
-        for idx, para in enumerate(doc.paragraphs):
-            para_data = {
-                'index': idx,
-                'text': para.text,
-                'has_image': self._has_drawing_elements(para),
-                'formatting': self._extract_paragraph_formatting(para),
-                'style': para.style.name if para.style else 'Normal'
-            }
-            structure['paragraphs'].append(para_data)
-
-        # Extract tables
-        for table_idx, table in enumerate(doc.tables):
-            table_data = {
-                'index': table_idx,
-                'rows': [],
-                'has_shading': False
-            }
-
-            for row in table.rows:
-                row_data = []
-                for cell in row.cells:
-                    cell_text = cell.text
-                    has_shading = self._cell_has_shading(cell)
-                    if has_shading:
-                        table_data['has_shading'] = True
-                    row_data.append({
-                        'text': cell_text,
-                        'has_shading': has_shading
-                    })
-                table_data['rows'].append(row_data)
+        with zipfile.ZipFile(input_path, 'r') as docx_zip:
+            style_names, default_style = self._read_paragraph_style_names(docx_zip)
+
+            # Only body-level paragraphs and tables are reported (same as doc.paragraphs / doc.tables);
+            # each one is released once handled so memory stays flat on large documents.
+            # Paragraphs whose first run has identical properties share one formatting dict,
+            # so the returned structure should be treated as read-only.
+            rpr_cache = {}
+            with docx_zip.open('word/document.xml') as stream:
+                for _, elem in etree.iterparse(stream, events=('end',), tag=(W_P, W_TBL), huge_tree=True,
+                                               collect_ids=False, resolve_entities=False, no_network=True):
+                    body = elem.getparent()
+                    if body is None or body.tag != W_BODY:
+                        continue
+
+                    if elem.tag == W_P:
+                        p_pr = elem.find(W_P_PR)
+                        p_style = p_pr.find(W_P_STYLE) if p_pr is not None else None
+                        style_id = p_style.get(W_VAL) if p_style is not None else None
+                        structure['paragraphs'].append({
+                            'index': len(structure['paragraphs']),
+                            'text': self._xml_paragraph_text(elem),
+                            'has_image': self._has_drawing_elements(elem),
+                            'formatting': self._extract_paragraph_formatting(elem, rpr_cache),
+                            'style': style_names.get(style_id, default_style)
+                        })
+                    else:
+                        structure['tables'].append(self._extract_xml_table(elem, len(structure['tables'])))
 
-            structure['tables'].append(table_data)
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del body[0]
 
         return structure
 
-    def _has_drawing_elements(self, paragraph):
-        """Check if paragraph contains images"""
+    def _read_paragraph_style_names(self, docx_zip):
+        """Map paragraph style ids to UI names, plus the name used when a paragraph has no valid style"""
+        style_names = {}
+        default_style = 'Normal'
         try:
-            p_element = paragraph._element
-            for child in p_element.iter():
-                if 'drawing' in str(child.tag).lower() or 'object' in str(child.tag).lower():
-                    return True
-            return False
-        except:
-            return False
-
-    def _extract_paragraph_formatting(self, paragraph):
-        """Extract formatting information from paragraph"""
-        formatting = {
-            'font_name': None,
-            'font_size': None,
-            'font_color': None,
-            'is_bold': False,
-            'is_italic': False
+            with docx_zip.open('word/styles.xml') as stream:
+                styles_root = etree.parse(stream, DOCX_PARSER).getroot()
+        except KeyError:
+            return style_names, default_style
+
+        for style in styles_root.iterchildren(W_STYLE):
+            if style.get(W_TYPE, 'paragraph') != 'paragraph':
+                continue
+            name_elem = style.find(W_NAME)
+            name = name_elem.get(W_VAL) if name_elem is not None else None
+            if name is not None:
+                name = UI_STYLE_NAMES.get(name, name)
+            style_names.setdefault(style.get(W_STYLE_ID), name)
+            if style.get(W_DEFAULT) == '1':
+                default_style = name
+        return style_names, default_style
+
+    def _extract_xml_table(self, tbl_element, table_idx):
+        """Extract cell text/shading from a w:tbl element, repeating merged cells once per grid column"""
+        table_data = {
+            'index': table_idx,
+            'rows': [],
+            'has_shading': False
         }
 
+        cells_above = {}
+        for tr in tbl_element.iterchildren(W_TR):
+            tr_pr = tr.find(W_TR_PR)
+            grid_before = tr_pr.find(W_GRID_BEFORE) if tr_pr is not None else None
+            grid_offset = int(grid_before.get(W_VAL, 0)) if grid_before is not None else 0
+
+            row_data = []
+            row_cells = {}
+            for tc in tr.iterchildren(W_TC):
+                tc_pr = tc.find(W_TC_PR)
+                grid_span = tc_pr.find(W_GRID_SPAN) if tc_pr is not None else None
+                span = int(grid_span.get(W_VAL, 1)) if grid_span is not None else 1
+                v_merge = tc_pr.find(W_V_MERGE) if tc_pr is not None else None
+
+                # A vertically merged continuation cell reports the cell that starts the merge
+                cell_data = None
+                if v_merge is not None and v_merge.get(W_VAL, 'continue') == 'continue':
+                    cell_data = cells_above.get(grid_offset)
+                if cell_data is None:
+                    cell_data = {
+                        'text': '\n'.join(self._xml_paragraph_text(p) for p in tc.iterchildren(W_P)),
+                        'has_shading': self._cell_has_shading(tc)
+                    }
+                if cell_data['has_shading']:
+                    table_data['has_shading'] = True
+
+                row_cells[grid_offset] = cell_data
+                row_data.extend([cell_data] * span)
+                grid_offset += span
+
+            cells_above = row_cells
+            table_data['rows'].append(row_data)
+
+        return table_data
+
+    def _xml_paragraph_text(self, p_element):
+        """Text of a w:p element: its runs plus the runs inside its hyperlinks"""
+        parts = []
+        for child in p_element:
+            if child.tag == W_R:
+                parts.append(self._xml_run_text(child))
+            elif child.tag == W_HYPERLINK:
+                parts.extend(self._xml_run_text(r) for r in child.iterchildren(W_R))
+        return ''.join(parts)
+
+    def _xml_run_text(self, r_element):
+        """Text of a w:r element, with tabs, breaks and no-break hyphens translated"""
+        parts = []
+        for child in r_element:
+            tag = child.tag
+            if tag == W_T:
+                parts.append(child.text or '')
+            elif tag == W_BR:
+                if child.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                    parts.append('\n')
+            elif tag in RUN_TEXT_TAGS:
+                parts.append(RUN_TEXT_TAGS[tag])
+        return ''.join(parts)
+
+    def _has_drawing_elements(self, p_element):
+        """Check if paragraph contains images"""
+        return next(p_element.iter(*DRAWING_TAGS), None) is not None
+
+    def _extract_paragraph_formatting(self, p_element, rpr_cache=None):
+        """Extract formatting information from the first run of a paragraph (memoized on its rPr XML)"""
+        formatting = dict(EMPTY_FORMATTING)
+
         try:
-            if paragraph.runs:
-                first_run = paragraph.runs[0]
-                if first_run.font.name:
-                    formatting['font_name'] = first_run.font.name
-                if first_run.font.size:
-                    formatting['font_size'] = first_run.font.size.pt
-                if first_run.font.color.rgb:
-                    rgb = first_run.font.color.rgb
-                    formatting['font_color'] = f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
-                formatting['is_bold'] = first_run.font.bold or False
-                formatting['is_italic'] = first_run.font.italic or False
-        except:
+            first_run = p_element.find(W_R)
+            if first_run is not None:
+                rPr = first_run.find(W_R_PR)
+                key = etree.tostring(rPr) if rPr is not None else b''
+                if rpr_cache is not None and key in rpr_cache:
+                    return rpr_cache[key]
+
+                if rPr is not None:
+                    r_fonts = rPr.find(W_R_FONTS)
+                    if r_fonts is not None and r_fonts.get(W_ASCII):
+                        formatting['font_name'] = r_fonts.get(W_ASCII)
+                    sz = rPr.find(W_SZ)
+                    if sz is not None and sz.get(W_VAL, '').isdigit() and int(sz.get(W_VAL)):
+                        formatting['font_size'] = int(sz.get(W_VAL)) / 2
+                    color = rPr.find(W_COLOR)
+                    if color is not None and HEX_COLOR.fullmatch(color.get(W_VAL, '')):
+                        formatting['font_color'] = f"#{color.get(W_VAL).lower()}"
+                    formatting['is_bold'] = self._xml_on_off(rPr.find(W_B))
+                    formatting['is_italic'] = self._xml_on_off(rPr.find(W_I))
+
+                if rpr_cache is not None:
+                    rpr_cache[key] = formatting
+        except XML_EDIT_ERRORS:
             pass
 
         return formatting
 
-    def _cell_has_shading(self, cell):
-        """Check if table cell has background shading"""
-        try:
-            tc_element = cell._tc
-            for child in tc_element.iter():
-                tag_str = str(child.tag).lower()
-                if 'shd' in tag_str:
-                    return True
-            return False
-        except:
+    def _xml_on_off(self, element):
+        """Read a toggle property such as w:b; a missing w:val means on"""
+        if element is None:
             return False
+        return element.get(W_VAL, 'true') not in ('0', 'false', 'off')
+
+    def _cell_has_shading(self, tc_element):
+        """Check if table cell has background shading"""
+        return next(tc_element.iter(W_SHD), None) is not None
 
     def _extract_html_structure(self, input_path):
         """Extract structure from HTML file"""
         if not HTML_AVAILABLE:
             raise ImportError("beautifulsoup4 not installed")
 
-        with open(input_path, 'r', encoding='utf-8') as file:
+        # The raw bytes go to BeautifulSoup, which decodes them as UTF-8 itself
+        with open(input_path, 'rb') as file:
             content = file.read()
 
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, HTML_PARSER, from_encoding='utf-8')
 
         structure = {
             'type': 'html',
@@ -216,22 +664,31 @@ class FileBlinder:
 
         return structure
 
-    def _extract_txt_structure(self, input_path):
-        """Extract structure from TXT file"""
+    def _read_text_file(self, input_path):
+        """Read a text file as UTF-8, falling back to Latin-1, with one read from disk"""
+        with open(input_path, 'rb') as file:
+            data = file.read()
         try:
-            with open(input_path, 'r', encoding='utf-8') as file:
-                content = file.read()
+            content = data.decode('utf-8')
         except UnicodeDecodeError:
-            with open(input_path, 'r', encoding='latin-1') as file:
-                content = file.read()
+            content = data.decode('latin-1')
+        # Same newline handling as reading in text mode
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+
+    def _extract_txt_structure(self, input_path):
+        """Extract structure from TXT file"""
+        content = self._read_text_file(input_path)
 
-        paragraphs = content.split('\n\n')
+        # Each paragraph is stripped once; the index still counts the blank ones
+        paragraphs = (para.strip() for para in content.split('\n\n'))
 
         structure = {
             'type': 'txt',
             'paragraphs': [
-                {'index': idx, 'text': para.strip()}
-                for idx, para in enumerate(paragraphs) if para.strip()
+                {'index': idx, 'text': text}
+                for idx, text in enumerate(paragraphs) if text
             ]
         }
 
@@ -239,8 +696,6 @@ class FileBlinder:
 
     def generate_diff(self, original_structure, processed_structure):
         """Generate diff between original and processed structures"""
-        import difflib
-
         diff_data = {
             'paragraph_changes': [],
             'image_changes': [],
@@ -256,12 +711,11 @@ class FileBlinder:
             orig_text = orig_para.get('text', '')
             proc_text = proc_para.get('text', '')
 
+            # Unchanged paragraphs (the bulk of a blinded document) never reach the matcher
             if orig_text != proc_text:
-                # Generate character-level diff
-                matcher = difflib.SequenceMatcher(None, orig_text, proc_text)
                 text_changes = []
 
-                for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                for tag, i1, i2, j1, j2 in self._text_opcodes(orig_text, proc_text):
                     if tag == 'replace':
                         text_changes.append({
                             'type': 'replace',
@@ -319,371 +773,501 @@ class FileBlinder:
 
         return diff_data
 
+    def _text_opcodes(self, a, b):
+        """Character-level (tag, i1, i2, j1, j2) opcodes turning a into b, in SequenceMatcher's format"""
+        if RAPIDFUZZ_AVAILABLE:
+            # rapidfuzz computes the alignment in C++; it reports a replacement as a delete next to
+            # an insert, so each run of edits between two equal spans is merged into one opcode
+            opcodes = []
+            pending = None
+            for tag, i1, i2, j1, j2 in Indel.opcodes(a, b).as_list():
+                if tag == 'equal':
+                    if pending is not None:
+                        opcodes.append(pending)
+                        pending = None
+                    opcodes.append((tag, i1, i2, j1, j2))
+                elif pending is None:
+                    pending = (tag, i1, i2, j1, j2)
+                else:
+                    i1, j1 = pending[1], pending[3]
+                    pending = ('replace' if i2 > i1 and j2 > j1 else tag, i1, i2, j1, j2)
+            if pending is not None:
+                opcodes.append(pending)
+            return opcodes
+
+        import difflib
+
+        # Generate character-level diff; autojunk would treat frequent characters
+        # in long paragraphs as junk and report whole-sentence replacements.
+        # The shared head and tail are trimmed first so the quadratic matcher only
+        # sees the span that actually changed.
+        prefix, suffix = self._common_affix_lengths(a, b)
+        matcher = difflib.SequenceMatcher(None, a[prefix:len(a) - suffix], b[prefix:len(b) - suffix], autojunk=False)
+        return [(tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix)
+                for tag, i1, i2, j1, j2 in matcher.get_opcodes()]
+
+    def _common_affix_lengths(self, a, b):
+        """Lengths of the common prefix and (non-overlapping) common suffix of two strings"""
+        # Binary search on slice equality keeps the character comparisons in C
+        limit = min(len(a), len(b))
+        low, high = 0, limit
+        while low < high:
+            mid = (low + high + 1) // 2
+            if a[:mid] == b[:mid]:
+                low = mid
+            else:
+                high = mid - 1
+        prefix = low
+
+        low, high = 0, limit - prefix
+        while low < high:
+            mid = (low + high + 1) // 2
+            if a[len(a) - mid:] == b[len(b) - mid:]:
+                low = mid
+            else:
+                high = mid - 1
+        return prefix, low
+
     def replace_keywords_in_text(self, text):
         """Replace keywords in text based on replacement dictionary"""
         if not text:
             return text
+        return self._replace_keywords_counted(text)[0]
+
+    def _replace_keywords_counted(self, text):
+        """replace_keywords_in_text returning (new_text, number_of_replacements), for callers that count"""
+        # Long texts are almost always unique, so they bypass the cache instead of evicting it
+        if len(text) > REPLACEMENT_CACHE_MAX_TEXT:
+            return self._replace_and_count(text)
+        return self._cached_replacements(text)
+
+    def _literal_step(self, literals):
+        """Build the replacement step for a group of literal keywords that can be matched in one scan"""
+        replacements = [replacement for _, replacement in literals]
+        pattern = re.compile('|'.join(f'({re.escape(original)})' for original, _ in literals), re.IGNORECASE)
+
+        def sub(match):
+            # One group per keyword
+            return replacements[match.lastindex - 1]
+
+        # With pyahocorasick installed, literals are matched by an automaton over the lowercased
+        # text instead, which stays linear no matter how many keywords there are
+        automaton = None
+        if AHOCORASICK_AVAILABLE and all(original and len(original.lower()) == len(original)
+                                         for original, _ in literals):
+            automaton = ahocorasick.Automaton()
+            for priority, (original, replacement) in enumerate(literals):
+                key = original.lower()
+                if key not in automaton:
+                    automaton.add_word(key, (priority, len(key), replacement))
+            automaton.make_automaton()
+        return 'literals', (pattern, sub, automaton)
+
+    def _regex_step(self, regexes):
+        """Build the replacement step for a run of consecutive regex keywords"""
+        # With google-re2 installed, regex keywords also get a linear-time RE2 pattern. RE2's \b and \d
+        # are ASCII-only, so it is only used on ASCII text, where it matches exactly like re does.
+        # Patterns RE2 cannot compile, and template replacements, stay on re.
+        if RE2_AVAILABLE:
+            options = re2.Options()
+            options.case_sensitive = False
+            options.log_errors = False
+        patterns = []
+        for pattern, replacement in regexes:
+            ascii_pattern = pattern
+            if RE2_AVAILABLE and '\\' not in replacement:
+                try:
+                    ascii_pattern = re2.compile(pattern.pattern, options)
+                except re2.error:
+                    pass
+            patterns.append((pattern, ascii_pattern, replacement))
+
+        # Most texts match none of the patterns. One search over their alternation rejects those
+        # texts in a single scan instead of one per pattern; when it finds nothing, none of the
+        # individual patterns can match either.
+        prefilter = None
+        sources = [pattern.pattern for pattern, _ in regexes]
+        if len(sources) > 1 and not any(BACKREFERENCE.search(source) for source in sources):
+            try:
+                prefilter = re.compile('|'.join(f'(?:{source})' for source in sources), re.IGNORECASE)
+            except re.error:
+                pass
+        return 'regex', (prefilter, patterns)
+
+    def _replace_and_count(self, text):
+        """Run the keyword pipeline over text, returning (new_text, number_of_replacements)"""
+        if self._keyword_prefilter is not None and self._keyword_prefilter.search(text) is None:
+            return text, 0
+
+        count = 0
+        for kind, step in self._keyword_steps:
+            if kind == 'exact':
+                original, replacement = step
+                found = text.count(original)
+                if found:
+                    text = text.replace(original, replacement)
+                    count += found
+
+            elif kind == 'literals':
+                pattern, sub, automaton = step
+                # The lowercased copy is only usable while it lines up with the text
+                lowered = text.lower() if automaton is not None else None
+                if lowered is not None and len(lowered) == len(text):
+                    text, found = self._replace_literals_automaton(text, lowered, automaton)
+                else:
+                    text, found = pattern.subn(sub, text)
+                count += found
 
-        for original, replacement in self.keyword_replacements.items():
-            # Use regex for pattern matching
-            if original.startswith(r'\b') or original.startswith(r'['):
-                text = re.sub(original, replacement, text, flags=re.IGNORECASE)
             else:
-                # Simple string replacement (case insensitive)
-                text = re.sub(re.escape(original), replacement, text, flags=re.IGNORECASE)
-
-        return text
+                prefilter, patterns = step
+                if prefilter is not None and prefilter.search(text) is None:
+                    continue
+                is_ascii = text.isascii()
+                for pattern, ascii_pattern, replacement in patterns:
+                    text, found = (ascii_pattern if is_ascii else pattern).subn(replacement, text)
+                    if found:
+                        count += found
+                        is_ascii = text.isascii()
+
+        return text, count
+
+    def _replace_literals_automaton(self, text, lowered, automaton):
+        """Splice automaton matches into text (leftmost first, keyword order breaking ties); returns (text, count)"""
+        matches = []
+        for end, (priority, length, replacement) in automaton.iter(lowered):
+            matches.append((end - length + 1, priority, end + 1, replacement))
+        if not matches:
+            return text, 0
+
+        matches.sort()
+        pieces = []
+        pos = 0
+        for start, _, end, replacement in matches:
+            if start < pos:
+                continue
+            pieces.append(text[pos:start])
+            pieces.append(replacement)
+            pos = end
+        pieces.append(text[pos:])
+        return ''.join(pieces), len(pieces) // 2
 
     def remove_document_themes(self, doc):
         """Remove document themes that might cause colored text - AGGRESSIVE VERSION"""
         try:
-            from docx.shared import RGBColor
-
             # Clear theme colors by setting document to a basic theme
             if hasattr(doc, 'settings'):
                 try:
                     doc.settings.theme = None
-                except:
+                except XML_EDIT_ERRORS:
                     pass
 
             # Also try to clear theme at the document level
             if hasattr(doc, '_element'):
-                doc_element = doc._element
+                # One query returns only the theme parts and theme references, so a document
+                # without any skips straight out and the rest never walks the whole tree
+                for elem in FIND_THEME_REFS(doc._element):
+                    tag = elem.tag
+                    if tag in THEME_TAGS or (tag == W_SHD and W_THEME_FILL in elem.attrib):
+                        # Remove theme elements and theme-filled shading entirely
+                        parent = elem.getparent()
+                        if parent is not None:
+                            parent.remove(elem)
+                        continue
 
-                # Find and remove theme elements
-                themes_to_remove = []
-                for child in doc_element.iter():
-                    tag_str = str(child.tag).lower()
-                    if any(theme_word in tag_str for theme_word in ['theme', 'themefont', 'clrscheme', 'fontscheme']):
-                        themes_to_remove.append(child)
+                    if tag == W_COLOR and elem.attrib.pop(W_THEME_COLOR, None) is not None:
+                        # Replace the theme color reference with explicit black
+                        elem.set(W_VAL, '000000')
 
-                for theme in themes_to_remove:
-                    parent = theme.getparent()
-                    if parent is not None:
-                        try:
-                            parent.remove(theme)
-                        except:
-                            pass
+                    # Remove theme tint/shade attributes
+                    elem.attrib.pop(W_THEME_TINT, None)
+                    elem.attrib.pop(W_THEME_SHADE, None)
 
-                # Remove any theme color references throughout the document
-                namespaces = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
+        except Exception as e:
+            # Continue if theme removal fails
+            pass
 
-                # Find and remove theme color references (w:themeColor)
-                try:
-                    for color_elem in doc_element.xpath('.//w:color[@w:themeColor]', namespaces=namespaces):
-                        # Remove the themeColor attribute
-                        theme_color_attr = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeColor'
-                        if theme_color_attr in color_elem.attrib:
-                            del color_elem.attrib[theme_color_attr]
-                        # Set explicit black color
-                        color_elem.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val', '000000')
-                except:
-                    pass
+    def _neutralize_theme_colors(self, color_elements):
+        """Set theme srgbClr colors to black and sysClr colors to black window text; returns True if any changed"""
+        changed = False
+        for element in color_elements:
+            if element.tag == A_SRGB_CLR:
+                if element.get('val') != '000000':
+                    element.set('val', '000000')
+                    changed = True
+            elif element.get('val') != 'windowText' or element.get('lastClr') != '000000':
+                element.set('val', 'windowText')
+                element.set('lastClr', '000000')
+                changed = True
+        return changed
+
+    def _neutralize_theme_part(self, data, find_colors):
+        """Return a theme part's XML with its colors neutralized, or None if it needs no rewrite"""
+        # Cheap byte scan first: a theme without explicit colors is never parsed
+        if b'srgbClr' not in data and b'sysClr' not in data:
+            return None
+        tree = etree.fromstring(data, DOCX_PARSER).getroottree()
+        if not self._neutralize_theme_colors(find_colors(tree)):
+            return None
+        return etree.tostring(tree, encoding='utf-8', xml_declaration=True, standalone=tree.docinfo.standalone)
+
+    def _zip_compress_type(self, name):
+        """Compression for a package part: stored if its format is already compressed, else deflated"""
+        if os.path.splitext(name)[1].lower() in PRECOMPRESSED_EXTENSIONS:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
+    def _force_black_color(self, rPr):
+        """Give run properties an explicit black w:color with no theme color (lxml or ElementTree)"""
+        color_elem = rPr.find(W_COLOR)
+        if color_elem is None:
+            color_elem = rPr.makeelement(W_COLOR, {})
+            rPr.insert(0, color_elem)
+        color_elem.set(W_VAL, '000000')
+        for attr in THEME_COLOR_ATTRS:
+            color_elem.attrib.pop(attr, None)
+
+    def _replace_run_color(self, rPr):
+        """Swap every color/highlight child of run properties for one explicit black w:color"""
+        for child in list(rPr):
+            if COLOR_HIGHLIGHT_TAG_MATCH[child.tag]:
+                rPr.remove(child)
+        # makeelement copies the attribute dict, so the shared constant is never mutated
+        rPr.insert(0, rPr.makeelement(W_COLOR, BLACK_COLOR_ATTRIB))
+
+    def _unwrap_xml_hyperlinks(self, hyperlinks):
+        """Replace each w:hyperlink with its own runs, minus underline and with black text; returns the count"""
+        unwrapped = 0
+        for hyperlink in hyperlinks:
+            parent = hyperlink.getparent()
+            if parent is None:
+                continue
+            hyperlink_index = parent.index(hyperlink)
+
+            # Clean up the hyperlink formatting (blue color, underline) in its runs
+            children = list(hyperlink)
+            for child in children:
+                if child.tag == W_R:
+                    for rPr in child.findall(W_R_PR):
+                        for u_elem in rPr.findall(W_U):
+                            rPr.remove(u_elem)
+                        self._force_black_color(rPr)
+
+            # Swap the hyperlink for its runs with one slice assignment; no insert per child
+            # and no second scan of the parent to find the hyperlink again for remove()
+            parent[hyperlink_index:hyperlink_index + 1] = children
+            unwrapped += 1
+        return unwrapped
+
+    def _clean_header_footer_xml(self, root):
+        """Blind a header/footer part in place; returns (images_removed, hyperlinks_removed, text_replacements)"""
+        # Remove images/embedded objects and shading and FORCE ALL TEXT TO BLACK COLOR in one traversal
+        images_removed = 0
+        elements_to_remove = []
+        for elem in root.iter(W_DRAWING, W_OBJECT, W_SHD, W_R_PR):
+            tag = elem.tag
+            if tag == W_R_PR:
+                self._force_black_color(elem)
+            else:
+                elements_to_remove.append(elem)
+                if tag != W_SHD:
+                    images_removed += 1
 
-                # Remove theme fill references
-                try:
-                    for fill_elem in doc_element.xpath('.//w:shd[@w:themeFill]', namespaces=namespaces):
-                        theme_fill_attr = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeFill'
-                        if theme_fill_attr in fill_elem.attrib:
-                            del fill_elem.attrib[theme_fill_attr]
-                        # Remove the entire shading element
-                        parent = fill_elem.getparent()
-                        if parent is not None:
-                            parent.remove(fill_elem)
-                except:
-                    pass
+        for elem in elements_to_remove:
+            parent = elem.getparent()
+            if parent is not None:
+                parent.remove(elem)
+
+        # Collect text and hyperlinks in a second one
+        texts = []
+        hyperlinks = []
+        for elem in root.iter(W_HYPERLINK, W_T):
+            if elem.tag == W_HYPERLINK:
+                hyperlinks.append(elem)
+            elif elem.text:
+                texts.append(elem)
+        text_replacements = self._replace_in_text_elements(texts)
+
+        # Remove hyperlinks while preserving text
+        return images_removed, self._unwrap_xml_hyperlinks(hyperlinks), text_replacements
+
+    def _replace_in_text_elements(self, elements):
+        """Replace keywords in the text of w:t elements, returning how many changed"""
+        if self._joined_prefilter is not None and len(elements) > 1:
+            # One prefilter scan over the joined texts finds the elements a keyword can touch;
+            # a match that runs across a separator marks every element it overlaps
+            texts = [elem.text for elem in elements]
+            ends = list(itertools.accumulate(len(text) + 1 for text in texts))
+            hits = set()
+            for match in self._joined_prefilter.finditer(TEXT_NODE_SEPARATOR.join(texts)):
+                first = bisect.bisect_right(ends, match.start())
+                last = bisect.bisect_right(ends, max(match.start(), match.end() - 1))
+                hits.update(range(first, last + 1))
+            elements = [elements[index] for index in sorted(hits)]
+
+        replacements = 0
+        for elem in elements:
+            new_text, found = self._replace_keywords_counted(elem.text)
+            if found:
+                elem.text = new_text
+                replacements += 1
+        return replacements
+
+    def _sanitize_document_xml(self, root):
+        """Strip shading, highlights, borders and theme colors from an element tree in a single walk"""
+        # lxml filters the walk down to the candidate tags in C; only those reach Python
+        tags = SANITIZE_TAGS | {W_COLOR} if self.font_color_black else SANITIZE_TAGS
+        elements_to_remove = []
+        for elem in root.iter(*tags):
+            tag = elem.tag
+            if tag in SANITIZE_TAGS:
+                elements_to_remove.append(elem)
+            elif tag == W_COLOR and self.font_color_black and W_THEME_COLOR in elem.attrib:
+                for attr in THEME_COLOR_ATTRS:
+                    elem.attrib.pop(attr, None)
+                elem.set(W_VAL, '000000')
+
+        for elem in elements_to_remove:
+            parent = elem.getparent()
+            if parent is not None:
+                parent.remove(elem)
+
+        return len(elements_to_remove)
+
+    def _sanitize_table_shading(self, tbl_element):
+        """Strip row and cell shading from a table in a single walk"""
+        elements_to_remove = list(tbl_element.iter(*SHADING_TAGS))
+        for elem in elements_to_remove:
+            parent = elem.getparent()
+            if parent is not None:
+                parent.remove(elem)
 
-                # Remove theme tint/shade attributes
-                try:
-                    for elem in doc_element.xpath('.//*[@w:themeTint or @w:themeShade]', namespaces=namespaces):
-                        for attr in ['{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeTint',
-                                     '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeShade']:
-                            if attr in elem.attrib:
-                                del elem.attrib[attr]
-                except:
-                    pass
+    def remove_table_cell_shading(self, cell):
+        """Remove background shading from a table cell"""
+        self._sanitize_table_shading(cell._tc)
 
-        except Exception as e:
-            # Continue if theme removal fails
-            pass
+    def remove_table_row_shading(self, row):
+        """Remove background shading from a table row (and its cells)"""
+        self._sanitize_table_shading(row._tr)
 
     def standardize_run_formatting(self, run):
         """Apply standard formatting to a text run"""
         if not self.standardize_formatting:
             return
 
+        # Edit the run's rPr directly instead of going through python-docx's Font proxies;
+        # the oxml get_or_add helpers keep the child elements in schema order
         try:
-            # Set font name
+            rPr = run._element.get_or_add_rPr()
+
+            # Set font name (runs already in the target font are only read, not rewritten)
             if self.font_name:
-                run.font.name = self.font_name
+                rFonts = rPr.get_or_add_rFonts()
+                if rFonts.get(W_ASCII) != self.font_name:
+                    rFonts.set(W_ASCII, self.font_name)
+                if rFonts.get(W_H_ANSI) != self.font_name:
+                    rFonts.set(W_H_ANSI, self.font_name)
 
             # Set font size if specified
-            if self.font_size:
-                from docx.shared import Pt
-                run.font.size = Pt(self.font_size)
+            if self._run_sz_val:
+                sz = rPr.get_or_add_sz()
+                if sz.get(W_VAL) != self._run_sz_val:
+                    sz.set(W_VAL, self._run_sz_val)
 
-            # Aggressively set font color to black (remove all colors including theme colors)
+            # Drop the run color (including theme colors) so text falls back to automatic black
             if self.font_color_black:
-                from docx.shared import RGBColor
-                run.font.color.rgb = RGBColor(0, 0, 0)  # Black
-
-                # Also clear theme color more aggressively
-                try:
-                    run.font.color.theme_color = None
-                    # Try to clear any color index
-                    if hasattr(run.font.color, '_color_val'):
-                        run.font.color._color_val = None
-                except:
-                    pass
+                rPr._remove_color()
 
-            # Remove all highlighting and shading
-            run.font.highlight_color = None  # Remove highlight
-
-            # Also try to clear any theme-based highlighting
-            try:
-                if hasattr(run._element, 'rPr'):
-                    rPr = run._element.rPr
-                    if rPr is not None:
-                        # Remove highlight elements
-                        highlights_to_remove = []
-                        for child in rPr:
-                            if 'highlight' in str(child.tag).lower() or 'shd' in str(child.tag).lower():
-                                highlights_to_remove.append(child)
-
-                        for highlight in highlights_to_remove:
-                            rPr.remove(highlight)
-            except:
-                pass
+            # Remove all highlighting and shading; lxml picks them out of the children in C
+            for child in list(rPr.iterchildren(*RUN_HIGHLIGHT_TAGS)):
+                rPr.remove(child)
 
             # Remove underlines and other special formatting while keeping bold/italic
             # run.font.underline = None  # Uncomment if you want to remove underlines too
 
-        except Exception as e:
+        except XML_EDIT_ERRORS:
             # If formatting fails, continue - text replacement is more important
             pass
 
-    def remove_table_cell_shading(self, cell):
-        """Remove background shading from a table cell - AGGRESSIVE VERSION"""
-        try:
-            # Work at the XML level to remove cell shading
-            tc_element = cell._tc
-
-            # Find and remove ALL shading/fill/background elements from the cell
-            shading_elements_to_remove = []
-            for child in tc_element.iter():
-                tag_str = str(child.tag).lower()
-                # Check for any shading-related tags
-                if any(shading_word in tag_str for shading_word in ['shd', 'fill', 'background', 'bgcolor']):
-                    shading_elements_to_remove.append(child)
-
-            for shading_elem in shading_elements_to_remove:
-                parent = shading_elem.getparent()
-                if parent is not None:
-                    try:
-                        parent.remove(shading_elem)
-                    except:
-                        pass
-
-            # Also check for table cell properties and remove shading using XPath
-            try:
-                namespaces = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-
-                # Remove shading from cell properties
-                for tcPr in tc_element.xpath('.//w:tcPr', namespaces=namespaces):
-                    # Remove any shading within table cell properties
-                    for shd in tcPr.xpath('.//w:shd', namespaces=namespaces):
-                        tcPr.remove(shd)
-
-                    # Also remove any fill elements
-                    for fill_elem in tcPr.xpath('.//*[contains(local-name(), "fill")]'):
-                        try:
-                            fill_elem.getparent().remove(fill_elem)
-                        except:
-                            pass
-            except:
-                pass
-
-            # Additional cleanup: clear any attributes that might contain color
-            try:
-                if hasattr(tc_element, 'attrib'):
-                    # Remove any color/fill attributes
-                    attrs_to_remove = [k for k in tc_element.attrib.keys()
-                                       if any(x in str(k).lower() for x in ['color', 'fill', 'shd', 'background'])]
-                    for attr in attrs_to_remove:
-                        del tc_element.attrib[attr]
-            except:
-                pass
-
-        except Exception as e:
-            # Continue if cell shading removal fails
-            pass
-
-    def remove_table_row_shading(self, row):
-        """Remove background shading from a table row"""
-        try:
-            # Work at the XML level to remove row shading
-            tr_element = row._tr
-
-            # Find and remove ALL shading/fill/background elements from the row
-            shading_elements_to_remove = []
-            for child in tr_element.iter():
-                tag_str = str(child.tag).lower()
-                # Check for any shading-related tags
-                if any(shading_word in tag_str for shading_word in ['shd', 'fill', 'background', 'bgcolor']):
-                    shading_elements_to_remove.append(child)
-
-            for shading_elem in shading_elements_to_remove:
-                parent = shading_elem.getparent()
-                if parent is not None:
-                    try:
-                        parent.remove(shading_elem)
-                    except:
-                        pass
-
-            # Also check for table row properties and remove shading using XPath
-            try:
-                namespaces = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-
-                # Remove shading from row properties
-                for trPr in tr_element.xpath('.//w:trPr', namespaces=namespaces):
-                    # Remove any shading within table row properties
-                    for shd in trPr.xpath('.//w:shd', namespaces=namespaces):
-                        trPr.remove(shd)
-            except:
-                pass
-
-        except Exception as e:
-            # Continue if row shading removal fails
-            pass
-
     def remove_content_control_shading(self, doc):
         """Remove background colors and styling from content controls - SURGICAL APPROACH"""
         try:
-            from docx.shared import RGBColor
-            from xml.etree import ElementTree as ET
-
             # Get the document element
             doc_element = doc._element
 
-            namespaces = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-                          'w15': 'http://schemas.microsoft.com/office/word/2012/wordml'}
+            debug = self._debug and logger.isEnabledFor(logging.DEBUG)
 
             print("  Searching for content controls...")
 
-            # Find all SDT (structured document tag) elements
-            sdt_elements = []
-            try:
-                sdt_elements.extend(doc_element.xpath('.//w:sdt', namespaces=namespaces))
-            except:
-                pass
-
-            for elem in doc_element.iter():
-                if 'sdt' in str(elem.tag).lower():
-                    if elem not in sdt_elements:
-                        sdt_elements.append(elem)
-
+            # Find all SDT (structured document tag) elements and their properties. Each query
+            # returns every match in the document exactly once, in document order, so nothing
+            # needs de-duplicating and the properties of nested controls are included.
+            sdt_elements = FIND_SDT(doc_element)
             print(f"  Found {len(sdt_elements)} content controls")
 
-            # Find all SDT properties
-            sdtPr_elements = []
-            try:
-                sdtPr_elements.extend(doc_element.xpath('.//w:sdtPr', namespaces=namespaces))
-            except:
-                pass
-
-            for elem in doc_element.iter():
-                if 'sdtpr' in str(elem.tag).lower():
-                    if elem not in sdtPr_elements:
-                        sdtPr_elements.append(elem)
-
+            sdtPr_elements = FIND_SDT_PR(doc_element)
             print(f"  Found {len(sdtPr_elements)} SDT property elements")
 
-            # Collect all unique SDT properties
-            all_sdtPr_to_process = set()
-            for sdt in sdt_elements:
-                try:
-                    for sdtPr in sdt.xpath('.//w:sdtPr', namespaces=namespaces):
-                        all_sdtPr_to_process.add(sdtPr)
-                except:
-                    pass
-                for child in sdt:
-                    if 'sdtpr' in str(child.tag).lower():
-                        all_sdtPr_to_process.add(child)
-
-            for sdtPr in sdtPr_elements:
-                all_sdtPr_to_process.add(sdtPr)
-
-            print(f"  Processing {len(all_sdtPr_to_process)} unique SDT property elements...")
+            print(f"  Processing {len(sdtPr_elements)} unique SDT property elements...")
 
             # Process each SDT property - SURGICAL removal of only styling elements
-            for sdtPr in all_sdtPr_to_process:
+            for sdtPr in sdtPr_elements:
                 try:
                     # List of element types to remove (these cause styling/borders)
                     elements_to_remove = []
 
                     for child in list(sdtPr):
-                        tag_lower = str(child.tag).lower()
-                        # Remove specific styling elements that cause borders/backgrounds
-                        if any(x in tag_lower for x in [
-                            'rpr',  # Run properties (text color, font)
-                            'ppr',  # Paragraph properties
-                            'color',  # Color elements
-                            'shd',  # Shading
-                            'fill',  # Fill color
-                            'background',  # Background
-                            'bdr',  # Border
-                            'border'  # Border variant
-                        ]):
+                        # Remove specific styling elements that cause borders/backgrounds:
+                        # run/paragraph properties, colors, shading, fills, backgrounds and borders
+                        if SDT_STYLING_TAG_MATCH[child.tag]:
                             elements_to_remove.append(child)
-                            print(f"      Marking for removal: {child.tag}")
+                            if debug:
+                                logger.debug("Marking for removal: %s", child.tag)
 
                     # Remove the styling elements
                     for elem in elements_to_remove:
                         try:
                             sdtPr.remove(elem)
-                            print(f"      Removed: {elem.tag}")
+                            if debug:
+                                logger.debug("Removed: %s", elem.tag)
                         except Exception as e:
-                            print(f"      Could not remove {elem.tag}: {e}")
+                            if debug:
+                                logger.debug("Could not remove %s: %s", elem.tag, e)
 
                     # Check if appearance element exists
                     appearance_exists = False
                     for child in sdtPr:
-                        if 'appearance' in str(child.tag).lower():
+                        if child.tag in APPEARANCE_TAGS:
                             # Update existing appearance to hidden
-                            child.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val', 'hidden')
+                            child.set(W_VAL, 'hidden')
                             appearance_exists = True
-                            print(f"      Updated appearance to hidden")
+                            if debug:
+                                logger.debug("Updated appearance to hidden")
                             break
 
                     # Add appearance="hidden" if it doesn't exist
                     if not appearance_exists:
-                        appearance_elem = ET.Element(
-                            '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}appearance')
-                        appearance_elem.set(
-                            '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val', 'hidden')
-                        sdtPr.insert(0, appearance_elem)
-                        print(f"      Added appearance=hidden")
+                        sdtPr.insert(0, sdtPr.makeelement(W_APPEARANCE, HIDDEN_APPEARANCE_ATTRIB))
+                        if debug:
+                            logger.debug("Added appearance=hidden")
 
                     # Check if showingPlcHdr exists
                     showing_exists = False
                     for child in sdtPr:
-                        if 'showingplchdr' in str(child.tag).lower():
+                        if child.tag == W_SHOWING_PLC_HDR:
                             # Update to not show placeholder
-                            child.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val', '0')
+                            child.set(W_VAL, '0')
                             showing_exists = True
-                            print(f"      Updated showingPlcHdr to 0")
+                            if debug:
+                                logger.debug("Updated showingPlcHdr to 0")
                             break
 
                     # Add showingPlcHdr="0" if it doesn't exist
                     if not showing_exists:
-                        showing_elem = ET.Element(
-                            '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}showingPlcHdr')
-                        showing_elem.set(
-                            '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val', '0')
                         # Insert after appearance if it exists
                         insert_pos = 1 if appearance_exists else 0
-                        sdtPr.insert(insert_pos, showing_elem)
-                        print(f"      Added showingPlcHdr=0")
+                        sdtPr.insert(insert_pos, sdtPr.makeelement(W_SHOWING_PLC_HDR, NO_PLACEHOLDER_ATTRIB))
+                        if debug:
+                            logger.debug("Added showingPlcHdr=0")
 
                 except Exception as e:
                     print(f"    Error processing SDT property: {e}")
@@ -694,35 +1278,41 @@ class FileBlinder:
             print("  Removing styles from content inside all SDTs...")
             for sdt in sdt_elements:
                 try:
-                    for sdtContent in sdt.iter():
-                        if 'sdtcontent' in str(sdtContent.tag).lower():
-                            for para in sdtContent.iter():
-                                if para.tag.endswith('}p') or 'p' == str(para.tag).split('}')[-1]:
-                                    for pPr in para.findall('.//w:pPr', namespaces=namespaces):
-                                        # Remove paragraph style references
-                                        for pStyle in pPr.findall('.//w:pStyle', namespaces=namespaces):
-                                            pPr.remove(pStyle)
-                                            print(f"      Removed paragraph style from SDT content")
-                                        # Remove shading
-                                        for shd in pPr.findall('.//w:shd', namespaces=namespaces):
-                                            pPr.remove(shd)
-                                            print(f"      Removed paragraph shading from SDT content")
-                                        # Remove borders
-                                        for pBdr in pPr.findall('.//w:pBdr', namespaces=namespaces):
-                                            pPr.remove(pBdr)
-                                            print(f"      Removed paragraph border from SDT content")
-
-                                    # Process runs
-                                    for run in para.findall('.//w:r', namespaces=namespaces):
-                                        for rPr in run.findall('.//w:rPr', namespaces=namespaces):
-                                            # Remove run style references
-                                            for rStyle in rPr.findall('.//w:rStyle', namespaces=namespaces):
-                                                rPr.remove(rStyle)
-                                                print(f"      Removed run style from SDT content")
-                                            # Remove shading
-                                            for shd in rPr.findall('.//w:shd', namespaces=namespaces):
-                                                rPr.remove(shd)
-                                                print(f"      Removed run shading from SDT content")
+                    for sdtContent in sdt.iter(W_SDT_CONTENT):
+                        for para in sdtContent.iter(W_P):
+                            # pPr is a direct child of w:p; a descendant search would also reach the
+                            # w:pPrChange copy, whose children pPr.remove() cannot take
+                            pPr = para.find(W_P_PR)
+                            if pPr is not None:
+                                # Remove paragraph style references
+                                for pStyle in pPr.findall(W_P_STYLE):
+                                    pPr.remove(pStyle)
+                                    if debug:
+                                        logger.debug("Removed paragraph style from SDT content")
+                                # Remove shading
+                                for shd in pPr.findall(W_SHD):
+                                    pPr.remove(shd)
+                                    if debug:
+                                        logger.debug("Removed paragraph shading from SDT content")
+                                # Remove borders
+                                for pBdr in pPr.findall(W_P_BDR):
+                                    pPr.remove(pBdr)
+                                    if debug:
+                                        logger.debug("Removed paragraph border from SDT content")
+
+                            # Process runs
+                            for run in para.iter(W_R):
+                                for rPr in run.iter(W_R_PR):
+                                    # Remove run style references
+                                    for rStyle in rPr.findall(W_R_STYLE):
+                                        rPr.remove(rStyle)
+                                        if debug:
+                                            logger.debug("Removed run style from SDT content")
+                                    # Remove shading
+                                    for shd in rPr.findall(W_SHD):
+                                        rPr.remove(shd)
+                                        if debug:
+                                            logger.debug("Removed run shading from SDT content")
                 except Exception as e:
                     print(f"  Error processing SDT content: {e}")
 
@@ -732,205 +1322,132 @@ class FileBlinder:
             print(traceback.format_exc())
 
     def remove_paragraph_borders(self, paragraph):
-        """Remove paragraph borders"""
-        try:
-            # Remove borders at the paragraph format level
-            paragraph_format = paragraph.paragraph_format
-
-            # Clear paragraph borders
-            if hasattr(paragraph_format, 'borders'):
-                borders = paragraph_format.borders
-                if borders:
-                    try:
-                        borders.top = None
-                        borders.bottom = None
-                        borders.left = None
-                        borders.right = None
-                    except:
-                        pass
-
-            # Also work at the XML level to remove border elements
-            p_element = paragraph._element
-
-            # Find and remove all border-related elements
-            border_elements_to_remove = []
-            for child in p_element.iter():
-                tag_str = str(child.tag).lower()
-                if any(border_word in tag_str for border_word in ['bdr', 'border', 'pBdr']):
-                    border_elements_to_remove.append(child)
-
-            for border_elem in border_elements_to_remove:
-                parent = border_elem.getparent()
-                if parent is not None:
-                    parent.remove(border_elem)
+        """Remove paragraph borders (along with the rest of what _sanitize_document_xml strips)"""
+        self._sanitize_document_xml(paragraph._p)
 
-            # Also check for paragraph properties and remove borders
-            try:
-                for pPr in p_element.xpath('.//w:pPr', namespaces={
-                    'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}):
-                    # Remove any borders within paragraph properties
-                    for border in pPr.xpath('.//w:pBdr', namespaces={
-                        'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}):
-                        pPr.remove(border)
-            except:
-                pass
+    def remove_paragraph_shading(self, paragraph):
+        """Remove paragraph-level shading and highlights (along with the rest of what _sanitize_document_xml strips)"""
+        self._sanitize_document_xml(paragraph._p)
 
+    def remove_hyperlinks_from_paragraph(self, paragraph):
+        """Remove hyperlinks from a paragraph while preserving the text content"""
+        try:
+            self._clean_paragraph(paragraph._element)
         except Exception as e:
-            # Continue if border removal fails
+            # Continue if hyperlink removal fails
             pass
 
-    def remove_paragraph_shading(self, paragraph):
-        """Remove paragraph-level shading and background colors"""
-        try:
-            # Remove paragraph shading at multiple levels
-            paragraph_format = paragraph.paragraph_format
-
-            # Clear paragraph-level shading
-            if hasattr(paragraph_format, 'shading'):
-                shading = paragraph_format.shading
-                if shading:
-                    shading.background_pattern_color = None
-                    shading.foreground_pattern_color = None
-                    # Also try to clear the fill
+    def _clean_paragraph(self, p_element):
+        """Unwrap hyperlinks and strip underline/color from the paragraph's runs in one XML pass"""
+        # Most paragraphs (empty spacers, runs already normalised) need nothing; find out in C
+        needs_clean = NEEDS_CLEAN_COLOR if self.font_color_black else NEEDS_CLEAN
+        if not needs_clean(p_element):
+            return
+
+        # Process each hyperlink
+        for hyperlink in FIND_HYPERLINKS(p_element):
+            # Extract all text runs from the hyperlink before removing it
+            # Hyperlinks contain runs (w:r elements) that have the actual text
+            parent = hyperlink.getparent()
+            if parent is not None:
+                # Get the position of the hyperlink in the parent
+                hyperlink_index = parent.index(hyperlink)
+
+                # Extract all child elements (runs) from the hyperlink
+                children_to_preserve = list(hyperlink)
+
+                # Process each run to remove hyperlink formatting (underline, blue color)
+                for child in children_to_preserve:
+                    # Look for run properties (rPr) within each run
                     try:
-                        shading.fill = None
-                    except:
+                        for rPr in child.iter(W_R_PR):
+                            # Remove underline elements and color elements (the blue hyperlink color)
+                            for elem in rPr.findall(W_U) + rPr.findall(W_COLOR):
+                                rPr.remove(elem)
+                    except XML_EDIT_ERRORS:
                         pass
 
-            # Also work at the XML level to remove shading elements
-            p_element = paragraph._element
-
-            # Find and remove all shading-related elements
-            shading_elements_to_remove = []
-            for child in p_element.iter():
-                tag_str = str(child.tag).lower()
-                if any(shading_word in tag_str for shading_word in ['shd', 'fill', 'highlight', 'bgcolor']):
-                    shading_elements_to_remove.append(child)
-
-            for shading_elem in shading_elements_to_remove:
-                parent = shading_elem.getparent()
-                if parent is not None:
-                    parent.remove(shading_elem)
+                # Replace the hyperlink element with its runs in a single splice
+                parent[hyperlink_index:hyperlink_index + 1] = children_to_preserve
 
-            # Also check for paragraph properties and remove background colors
+        # After removing hyperlinks, process all runs again to ensure formatting.
+        # Working on the run XML directly avoids building Run/Font/ColorFormat proxies per run.
+        for r in p_element.iterchildren(W_R):
             try:
-                for pPr in p_element.xpath('.//w:pPr', namespaces={
-                    'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}):
-                    # Remove any shading within paragraph properties
-                    for shd in pPr.xpath('.//w:shd', namespaces={
-                        'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}):
-                        pPr.remove(shd)
-            except:
+                self._ensure_black_no_underline(r)
+            except XML_EDIT_ERRORS:
                 pass
 
-        except Exception as e:
-            # Continue if shading removal fails
-            pass
-
-    def remove_hyperlinks_from_paragraph(self, paragraph):
-        """Remove hyperlinks from a paragraph while preserving the text content"""
-        try:
-            from docx.shared import RGBColor
-
-            p_element = paragraph._element
+    def _ensure_black_no_underline(self, r):
+        """Strip underline and (when forcing black) color from a run, touching only what is there"""
+        rPr = r.find(W_R_PR)
+        if rPr is None:
+            # python-docx always left an (empty) rPr behind here; keep that
+            r.get_or_add_rPr()
+            return
 
-            # Find all hyperlink elements
-            hyperlinks = []
-            for child in p_element.iter():
-                if 'hyperlink' in str(child.tag).lower():
-                    hyperlinks.append(child)
-
-            # Process each hyperlink
-            for hyperlink in hyperlinks:
-                # Extract all text runs from the hyperlink before removing it
-                # Hyperlinks contain runs (w:r elements) that have the actual text
-                parent = hyperlink.getparent()
-                if parent is not None:
-                    # Get the position of the hyperlink in the parent
-                    hyperlink_index = list(parent).index(hyperlink)
+        # Remove underline
+        u = rPr.find(W_U)
+        if u is not None:
+            rPr.remove(u)
 
-                    # Extract all child elements (runs) from the hyperlink
-                    children_to_preserve = list(hyperlink)
+        # Drop the color (and any theme color) so the run renders black
+        if self.font_color_black:
+            color = rPr.find(W_COLOR)
+            if color is not None:
+                rPr.remove(color)
 
-                    # Process each run to remove hyperlink formatting (underline, blue color)
-                    for child in children_to_preserve:
-                        # Look for run properties (rPr) within each run
-                        try:
-                            for rPr in child.iter():
-                                if 'rPr' in str(rPr.tag):
-                                    # Remove underline elements
-                                    underlines_to_remove = []
-                                    for elem in rPr:
-                                        if 'u' in str(elem.tag).lower() and 'u' == str(elem.tag).split('}')[-1]:
-                                            underlines_to_remove.append(elem)
-
-                                    for u_elem in underlines_to_remove:
-                                        rPr.remove(u_elem)
-
-                                    # Remove color elements (the blue hyperlink color)
-                                    colors_to_remove = []
-                                    for elem in rPr:
-                                        if 'color' in str(elem.tag).lower():
-                                            colors_to_remove.append(elem)
-
-                                    for color_elem in colors_to_remove:
-                                        rPr.remove(color_elem)
-                        except:
-                            pass
+    def _blind_paragraph(self, paragraph, normal_style):
+        """Reset style, unwrap hyperlinks, replace keywords and standardize runs; returns (styles_reset, replacements)"""
+        styles_reset = 0
+        replacements = 0
 
-                    # Insert the runs directly into the paragraph where the hyperlink was
-                    for i, child in enumerate(children_to_preserve):
-                        parent.insert(hyperlink_index + i, child)
+        # FORCE PARAGRAPH STYLE TO NORMAL (removes heading styles, etc.)
+        try:
+            if normal_style is not None and paragraph.style.name != 'Normal':
+                paragraph.style = normal_style
+                styles_reset = 1
+        except XML_EDIT_ERRORS:
+            pass
 
-                    # Now remove the empty hyperlink element
-                    parent.remove(hyperlink)
+        # Unwrap hyperlinks first so their runs are in paragraph.runs below
+        self.remove_hyperlinks_from_paragraph(paragraph)
 
-            # After removing hyperlinks, process all runs again to ensure formatting
-            for run in paragraph.runs:
-                try:
-                    # Remove underline
-                    run.font.underline = None
+        for run in paragraph.runs:
+            # Run.text is rebuilt from the run's XML on every access, so read it once
+            original_text = run.text
+            if original_text:
+                # The match count says whether anything changed; no second scan comparing the texts
+                new_text, found = self._replace_keywords_counted(original_text)
+                if found:
+                    run.text = new_text
+                    replacements += 1
 
-                    # Set color to black
-                    if self.font_color_black:
-                        run.font.color.rgb = RGBColor(0, 0, 0)
-                        try:
-                            run.font.color.theme_color = None
-                        except:
-                            pass
-                except:
-                    pass
+            # Apply formatting standardization
+            self.standardize_run_formatting(run)
 
-        except Exception as e:
-            # Continue if hyperlink removal fails
-            pass
+        return styles_reset, replacements
 
-    def remove_list_formatting(self, paragraph):
+    def remove_list_formatting(self, paragraph, normal_style=None):
         """Remove list bullet highlighting and formatting"""
         try:
-            # Clear list formatting - reset to normal paragraph
-            paragraph.style = paragraph._document.styles['Normal']
-
-            # Remove paragraph numbering properties
-            paragraph_format = paragraph.paragraph_format
+            p_element = paragraph._element
 
-            # Clear left indent that might cause bullet appearance
-            paragraph_format.left_indent = None
-            paragraph_format.first_line_indent = None
+            # Clear list formatting - reset to normal paragraph. The caller looks the Normal
+            # style up once per document; it is the same object for every paragraph. A paragraph
+            # without a w:pStyle already uses the default style and is left alone.
+            if normal_style is not None and p_element.style is not None:
+                paragraph.style = normal_style
 
-            # Remove any numbering
-            p_element = paragraph._element
+            # Clear left indent that might cause bullet appearance. Without w:pPr there is none,
+            # and going through paragraph_format would only add an empty w:pPr.
+            if p_element.pPr is not None:
+                paragraph_format = paragraph.paragraph_format
+                paragraph_format.left_indent = None
+                paragraph_format.first_line_indent = None
 
             # Find and remove numbering properties
-            numbering_to_remove = []
-            for child in p_element.iter():
-                if 'numPr' in str(child.tag) or 'pPr' in str(child.tag):
-                    # Look for numbering inside pPr
-                    for subchild in child:
-                        if 'numPr' in str(subchild.tag):
-                            numbering_to_remove.append(subchild)
-
-            for num_element in numbering_to_remove:
+            for num_element in FIND_NUM_PR(p_element):
                 parent = num_element.getparent()
                 if parent is not None:
                     parent.remove(num_element)
@@ -958,102 +1475,89 @@ class FileBlinder:
 
         # STEP 1: PRE-PROCESS AT XML LEVEL (Remove content controls, etc.)
         print("Step 1: Pre-processing at XML level...")
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_dir = Path(temp_dir)
-
-            # Extract DOCX
-            print("  Extracting DOCX...")
-            with zipfile.ZipFile(temp_no_images, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
+        # The parts that change are rewritten in memory; every other entry is copied across as-is
+        with zipfile.ZipFile(temp_no_images, 'r') as zip_in:
+            names = zip_in.namelist()
+            rewritten_parts = {}
 
             namespaces = {
-                'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+                'w': W_NS,
             }
 
             for prefix, uri in namespaces.items():
                 ET.register_namespace(prefix, uri)
 
             # Process document.xml to remove content controls
-            document_xml = temp_dir / 'word' / 'document.xml'
+            document_xml = 'word/document.xml'
             sdts_removed = 0
 
-            if document_xml.exists():
+            if document_xml in names:
                 print("  Removing content controls from document.xml...")
-                tree = ET.parse(document_xml)
-                root = tree.getroot()
-                parent_map = {c: p for p in tree.iter() for c in p}
-
-                # Find and remove ALL content controls
-                for sdt in root.findall('.//w:sdt', namespaces):
-                    parent = parent_map.get(sdt)
-                    if parent is not None:
-                        sdt_index = list(parent).index(sdt)
-
-                        # Extract content from SDT (preserves tables and everything)
-                        sdt_content = sdt.find('.//w:sdtContent', namespaces)
-                        if sdt_content is not None:
-                            # Move all children from sdtContent to parent
-                            for child in list(sdt_content):
-                                parent.insert(sdt_index, child)
-                                sdt_index += 1
-
-                        # Remove the SDT wrapper entirely
-                        parent.remove(sdt)
-                        sdts_removed += 1
+                root = ET.fromstring(zip_in.read(document_xml))
+
+                # One walk over (parent, child) pairs finds everything this step edits; ElementTree
+                # has no parent pointers, so the pairs stand in for a separate parent map. Edits wait
+                # until the walk is done so the child lists are never changed under the iterator.
+                sdts = []
+                p_styles = []
+                run_properties = []
+                to_remove = []
+                for parent in root.iter():
+                    for child in parent:
+                        tag = child.tag
+                        if tag == W_R_PR:
+                            run_properties.append(child)
+                        elif tag == W_P_STYLE:
+                            if parent.tag == W_P_PR:
+                                p_styles.append((parent, child))
+                        elif tag == W_SDT:
+                            sdts.append((parent, child))
+                        elif tag == W_SHD or tag == W_P_BDR:
+                            to_remove.append((parent, child))
+
+                # Find and remove ALL content controls; nested ones are unwrapped first so each
+                # splice happens in a parent that is still part of the document
+                for parent, sdt in reversed(sdts):
+                    sdt_index = list(parent).index(sdt)
+
+                    # Extract content from SDT (preserves tables and everything)
+                    sdt_content = sdt.find(W_SDT_CONTENT)
+                    if sdt_content is not None:
+                        # Move all children from sdtContent to parent in one splice
+                        parent[sdt_index:sdt_index] = list(sdt_content)
+
+                    # Remove the SDT wrapper entirely
+                    parent.remove(sdt)
+                    sdts_removed += 1
 
                 # REMOVE ALL PARAGRAPH STYLES (force everything to Normal)
                 print("  Removing all paragraph styles (forcing to Normal)...")
                 styles_removed = 0
-                for para in root.findall('.//w:p', namespaces):
-                    for pPr in para.findall('.//w:pPr', namespaces):
-                        # Remove paragraph style references
-                        for pStyle in pPr.findall('.//w:pStyle', namespaces):
-                            pPr.remove(pStyle)
-                            styles_removed += 1
+                for pPr, pStyle in p_styles:
+                    # Remove paragraph style references
+                    pPr.remove(pStyle)
+                    styles_removed += 1
 
                 # Force ALL text to black color
                 print("  Forcing all text to black...")
                 colors_forced = 0
-                for rPr in root.findall('.//w:rPr', namespaces):
-                    # Remove existing color elements
-                    for color_elem in list(rPr):
-                        if 'color' in str(color_elem.tag).lower() or 'highlight' in str(color_elem.tag).lower():
-                            rPr.remove(color_elem)
-
-                    # Add black color
-                    color_elem = ET.Element('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}color')
-                    color_elem.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val', '000000')
-
-                    # Remove theme color attributes
-                    for attr in ['{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeColor',
-                                 '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeTint',
-                                 '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeShade']:
-                        if attr in color_elem.attrib:
-                            del color_elem.attrib[attr]
-
-                    rPr.insert(0, color_elem)
+                for rPr in run_properties:
+                    self._replace_run_color(rPr)
                     colors_forced += 1
 
-                # Remove ALL shading
-                print("  Removing all shading...")
+                # Remove ALL shading and paragraph borders
+                print("  Removing all shading and paragraph borders...")
                 shading_removed = 0
-                for shd in root.findall('.//w:shd', namespaces):
-                    parent = parent_map.get(shd)
-                    if parent is not None:
-                        parent.remove(shd)
-                        shading_removed += 1
-
-                # Remove ALL paragraph borders
-                print("  Removing all paragraph borders...")
                 borders_removed = 0
-                for pBdr in root.findall('.//w:pBdr', namespaces):
-                    parent = parent_map.get(pBdr)
-                    if parent is not None:
-                        parent.remove(pBdr)
+                for parent, elem in to_remove:
+                    parent.remove(elem)
+                    if elem.tag == W_SHD:
+                        shading_removed += 1
+                    else:
                         borders_removed += 1
 
                 # Save modified document.xml
-                tree.write(document_xml, encoding='utf-8', xml_declaration=True)
+                rewritten_parts[document_xml] = ET.tostring(root, encoding='utf-8', xml_declaration=True)
 
                 print(f"  ✓ Removed {sdts_removed} content controls")
                 print(f"  ✓ Removed {styles_removed} paragraph styles (forced to Normal)")
@@ -1063,56 +1567,50 @@ class FileBlinder:
 
             # Neutralize theme files (don't delete - python-docx expects them)
             print("  Neutralizing theme files...")
-            theme_dir = temp_dir / 'word' / 'theme'
-            if theme_dir.exists():
-                for theme_file in theme_dir.glob('*.xml'):
+            theme_parts = [name for name in names
+                           if name.startswith('word/theme/') and name.endswith('.xml') and name.count('/') == 2]
+            if theme_parts:
+                for theme_part in theme_parts:
                     try:
-                        tree = ET.parse(theme_file)
-                        root = tree.getroot()
-
                         # Replace all colors with black
-                        for element in root.iter():
-                            if 'srgbClr' in str(element.tag):
-                                element.set('val', '000000')
-                            elif 'sysClr' in str(element.tag):
-                                element.set('val', 'windowText')
-                                element.set('lastClr', '000000')
-
-                        tree.write(theme_file, encoding='utf-8', xml_declaration=True)
-                    except:
+                        data = self._neutralize_theme_part(zip_in.read(theme_part), FIND_THEME_COLORS)
+                        if data is not None:
+                            rewritten_parts[theme_part] = data
+                    except (etree.XMLSyntaxError, KeyError):
                         pass
                 print("  ✓ Neutralized theme files (colors set to black)")
 
             # Neutralize styles.xml
             print("  Neutralizing styles.xml...")
-            styles_xml = temp_dir / 'word' / 'styles.xml'
-            if styles_xml.exists():
-                tree = ET.parse(styles_xml)
+            styles_xml = 'word/styles.xml'
+            if styles_xml in names:
+                tree = ET.ElementTree(ET.fromstring(zip_in.read(styles_xml)))
                 root = tree.getroot()
                 parent_map = {c: p for p in tree.iter() for c in p}
 
                 for element in root.iter():
-                    if 'color' in str(element.tag).lower() or 'shd' in str(element.tag).lower():
+                    if COLOR_SHD_TAG_MATCH[element.tag]:
                         parent = parent_map.get(element)
                         if parent is not None:
                             try:
                                 parent.remove(element)
-                            except:
+                            except ValueError:
                                 pass
 
-                tree.write(styles_xml, encoding='utf-8', xml_declaration=True)
+                rewritten_parts[styles_xml] = ET.tostring(root, encoding='utf-8', xml_declaration=True)
                 print("  ✓ Neutralized styles.xml")
 
-            # Rebuild DOCX to temp file
+            # Rebuild DOCX in memory; python-docx loads it straight from the buffer
             print("  Rebuilding DOCX...")
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_preprocessed:
-                preprocessed_path = tmp_preprocessed.name
+            preprocessed = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
 
-            with zipfile.ZipFile(preprocessed_path, 'w', zipfile.ZIP_DEFLATED) as zip_out:
-                for file_path in temp_dir.rglob('*'):
-                    if file_path.is_file():
-                        arc_path = file_path.relative_to(temp_dir)
-                        zip_out.write(file_path, arc_path)
+            with zipfile.ZipFile(preprocessed, 'w', zipfile.ZIP_DEFLATED) as zip_out:
+                for info in zip_in.infolist():
+                    data = rewritten_parts.get(info.filename)
+                    if data is None:
+                        data = zip_in.read(info)
+                    info.compress_type = self._zip_compress_type(info.filename)
+                    zip_out.writestr(info, data)
 
             print("  ✓ Pre-processing complete\n")
 
@@ -1120,140 +1618,84 @@ class FileBlinder:
         try:
             if temp_no_images != input_path:  # Don't delete original
                 os.unlink(temp_no_images)
-        except:
+        except OSError:
             pass
 
         # STEP 2: PROCESS WITH PYTHON-DOCX (for remaining cleanup)
         print("Step 2: Processing with python-docx...")
         print("Loading document...")
-        doc = Document(preprocessed_path)
+        preprocessed.seek(0)
+        doc = Document(preprocessed)
+        preprocessed.close()
+
+        # Style, paragraph and table collections are rebuilt on every access, so fetch them once
+        try:
+            normal_style = doc.styles['Normal']
+        except KeyError:
+            normal_style = None
+        paragraphs = doc.paragraphs
+        paragraph_count = len(paragraphs)
+        tables = doc.tables
 
         text_replacements = 0
         styles_reset = 0
 
-        # Process paragraphs
+        # Process paragraphs. This stays on one thread: every paragraph is a node of the same lxml
+        # document, which must not be mutated from several threads, and the per-run work is
+        # Python-level and holds the GIL. Repeated run texts are served from the replacement cache.
         print("Processing paragraphs...")
-        for para_idx, paragraph in enumerate(doc.paragraphs):
-            if para_idx % 10 == 0:
-                print(f"  Processing paragraph {para_idx + 1}/{len(doc.paragraphs)}")
-
-            # FORCE PARAGRAPH STYLE TO NORMAL (removes heading styles, etc.)
-            try:
-                if paragraph.style.name != 'Normal':
-                    paragraph.style = doc.styles['Normal']
-                    styles_reset += 1
-            except:
-                pass
+        progress_step = max(PROGRESS_MIN_STEP, paragraph_count // PROGRESS_UPDATES)
+        for para_idx, paragraph in enumerate(paragraphs):
+            if para_idx % progress_step == 0:
+                print(f"  Processing paragraph {para_idx + 1}/{paragraph_count}")
 
-            # Process text in runs
-            for run in paragraph.runs:
-                if run.text:
-                    original_text = run.text
-                    new_text = self.replace_keywords_in_text(original_text)
-                    if new_text != original_text:
-                        run.text = new_text
-                        text_replacements += 1
-
-                # Apply formatting standardization
-                self.standardize_run_formatting(run)
-
-            # Remove hyperlinks, list formatting, borders, shading
-            self.remove_hyperlinks_from_paragraph(paragraph)
-            self.remove_list_formatting(paragraph)
-            self.remove_paragraph_borders(paragraph)
-            self.remove_paragraph_shading(paragraph)
+            # Style, hyperlinks and runs in one pass (borders/shading go in one pass below)
+            reset, replaced = self._blind_paragraph(paragraph, normal_style)
+            styles_reset += reset
+            text_replacements += replaced
+            self.remove_list_formatting(paragraph, normal_style)
 
         # Process tables
         print("Processing tables...")
-        for table_idx, table in enumerate(doc.tables):
-            print(f"  Processing table {table_idx + 1}/{len(doc.tables)}")
+        table_count = len(tables)
+        progress_step = max(1, table_count // PROGRESS_UPDATES)
+        for table_idx, table in enumerate(tables):
+            if table_idx % progress_step == 0:
+                print(f"  Processing table {table_idx + 1}/{table_count}")
             for row in table.rows:
-                self.remove_table_row_shading(row)
-
                 for cell in row.cells:
-                    self.remove_table_cell_shading(cell)
-
                     for paragraph in cell.paragraphs:
-                        # FORCE PARAGRAPH STYLE TO NORMAL in tables too
-                        try:
-                            if paragraph.style.name != 'Normal':
-                                paragraph.style = doc.styles['Normal']
-                                styles_reset += 1
-                        except:
-                            pass
-
-                        # Process text in cell runs
-                        for run in paragraph.runs:
-                            if run.text:
-                                original_text = run.text
-                                new_text = self.replace_keywords_in_text(original_text)
-                                if new_text != original_text:
-                                    run.text = new_text
-                                    text_replacements += 1
-
-                            self.standardize_run_formatting(run)
-
-                        self.remove_hyperlinks_from_paragraph(paragraph)
-                        self.remove_list_formatting(paragraph)
-                        self.remove_paragraph_borders(paragraph)
-                        self.remove_paragraph_shading(paragraph)
-
-        # Process headers and footers
+                        reset, replaced = self._blind_paragraph(paragraph, normal_style)
+                        styles_reset += reset
+                        text_replacements += replaced
+                        self.remove_list_formatting(paragraph, normal_style)
+
+        # Remove shading, borders and theme colors from the whole body in a single walk
+        print("Removing shading and borders...")
+        self._sanitize_document_xml(doc.element.body)
+
+        # Process headers and footers. A linked header/footer is the previous section's part
+        # (already processed), and for the first section python-docx would create an empty
+        # part just to hand back its paragraphs, so only sections with their own are visited.
         print("Processing headers and footers...")
         for section in doc.sections:
-            if section.header:
-                for paragraph in section.header.paragraphs:
-                    # FORCE PARAGRAPH STYLE TO NORMAL in headers
-                    try:
-                        if paragraph.style.name != 'Normal':
-                            paragraph.style = doc.styles['Normal']
-                            styles_reset += 1
-                    except:
-                        pass
-
-                    for run in paragraph.runs:
-                        if run.text:
-                            original_text = run.text
-                            new_text = self.replace_keywords_in_text(original_text)
-                            if new_text != original_text:
-                                run.text = new_text
-                                text_replacements += 1
-
-                        self.standardize_run_formatting(run)
-
-                    self.remove_hyperlinks_from_paragraph(paragraph)
-
-            if section.footer:
-                for paragraph in section.footer.paragraphs:
-                    # FORCE PARAGRAPH STYLE TO NORMAL in footers
-                    try:
-                        if paragraph.style.name != 'Normal':
-                            paragraph.style = doc.styles['Normal']
-                            styles_reset += 1
-                    except:
-                        pass
-
-                    for run in paragraph.runs:
-                        if run.text:
-                            original_text = run.text
-                            new_text = self.replace_keywords_in_text(original_text)
-                            if new_text != original_text:
-                                run.text = new_text
-                                text_replacements += 1
-
-                        self.standardize_run_formatting(run)
-
-                    self.remove_hyperlinks_from_paragraph(paragraph)
+            header = section.header
+            if not header.is_linked_to_previous:
+                for paragraph in header.paragraphs:
+                    reset, replaced = self._blind_paragraph(paragraph, normal_style)
+                    styles_reset += reset
+                    text_replacements += replaced
+
+            footer = section.footer
+            if not footer.is_linked_to_previous:
+                for paragraph in footer.paragraphs:
+                    reset, replaced = self._blind_paragraph(paragraph, normal_style)
+                    styles_reset += reset
+                    text_replacements += replaced
 
         print("Saving final document...")
         doc.save(output_path)
 
-        # Clean up temp file
-        try:
-            os.unlink(preprocessed_path)
-        except:
-            pass
-
         print(f"\n{'=' * 70}")
         print("✅ PROCESSING COMPLETE")
         print(f"{'=' * 70}")
@@ -1268,25 +1710,19 @@ class FileBlinder:
         return output_path
     def process_docx_xml_safe(self, input_path, output_path):
         """Process DOCX by safely modifying XML while preserving structure"""
+        if not LXML_AVAILABLE:
+            raise ImportError("lxml not installed. Run: pip install lxml")
 
-        # Create a temporary working directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_dir = Path(temp_dir)
-
-            # Extract the DOCX file
-            with zipfile.ZipFile(input_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-
-            # Define XML namespace
-            namespaces = {
-                'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-                'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
-                'a': 'http://schemas.openxmlformats.org/drawingml/2006/main'
-            }
+        # Only the theme, styles, document, header and footer parts change, so they are rewritten
+        # in memory and every other part is copied straight from the input package
+        with zipfile.ZipFile(input_path, 'r') as zip_in:
+            names = zip_in.namelist()
+            rewritten_parts = {}
 
-            # Register namespaces
-            for prefix, uri in namespaces.items():
-                ET.register_namespace(prefix, uri)
+            def word_parts(prefix):
+                """Names of the XML parts directly under word/ whose path starts with prefix"""
+                return [name for name in names
+                        if name.startswith(prefix) and name.endswith('.xml') and name.count('/') == prefix.count('/')]
 
             images_removed = 0
             text_replacements = 0
@@ -1294,70 +1730,45 @@ class FileBlinder:
 
             # NEUTRALIZE THEME FILES - Replace theme colors with black/white
             print("Neutralizing theme colors...")
-            theme_dir = temp_dir / 'word' / 'theme'
-            if theme_dir.exists():
-                for theme_file in theme_dir.glob('*.xml'):
-                    try:
-                        tree = ET.parse(theme_file)
-                        root = tree.getroot()
-
-                        # Find all color scheme elements and replace with neutral colors
-                        for color_scheme in root.iter():
-                            tag = str(color_scheme.tag)
-                            # Replace theme colors with black or white
-                            if 'clrScheme' in tag or 'color' in tag.lower():
-                                for color_elem in color_scheme:
-                                    # Set all colors to either black (000000) or white (FFFFFF)
-                                    for child in color_elem:
-                                        if 'srgbClr' in str(child.tag):
-                                            child.set('val', '000000')  # Black
-                                        elif 'sysClr' in str(child.tag):
-                                            child.set('val', 'windowText')
-                                            child.set('lastClr', '000000')
-
-                        tree.write(theme_file, encoding='utf-8', xml_declaration=True)
-                        print(f"  Neutralized {theme_file.name}")
-                    except Exception as e:
-                        print(f"  Could not process theme file {theme_file.name}: {e}")
+            for theme_part in word_parts('word/theme/'):
+                theme_name = theme_part.rsplit('/', 1)[-1]
+                try:
+                    # Replace the color scheme's colors with black; an already neutral theme is copied as-is
+                    data = self._neutralize_theme_part(zip_in.read(theme_part), FIND_SCHEME_COLORS)
+                    if data is not None:
+                        rewritten_parts[theme_part] = data
+                    print(f"  Neutralized {theme_name}")
+                except Exception as e:
+                    print(f"  Could not process theme file {theme_name}: {e}")
 
             # NEUTRALIZE STYLES.XML - Remove theme color references
             print("Neutralizing style theme references...")
-            styles_xml = temp_dir / 'word' / 'styles.xml'
-            if styles_xml.exists():
+            styles_xml = 'word/styles.xml'
+            if styles_xml in names:
                 try:
-                    tree = ET.parse(styles_xml)
-                    root = tree.getroot()
-
-                    # Build a parent map since ElementTree doesn't have getparent()
-                    parent_map = {c: p for p in tree.iter() for c in p}
-
-                    # First pass: Remove all theme color attributes
-                    for elem in root.iter():
-                        # Remove theme color attributes
-                        attrs_to_remove = []
-                        for attr_name in list(elem.attrib.keys()):
-                            if 'theme' in attr_name.lower() and 'color' in attr_name.lower():
-                                attrs_to_remove.append(attr_name)
+                    root = etree.fromstring(zip_in.read(styles_xml), DOCX_PARSER)
+                    tree = root.getroottree()
 
-                        for attr in attrs_to_remove:
-                            del elem.attrib[attr]
-
-                    # Second pass: Mark shading elements for removal (don't remove while iterating)
+                    # One pass removes theme color attributes and marks shading elements
+                    # for removal (don't remove while iterating)
                     elements_to_remove = []
                     for elem in root.iter():
-                        if 'shd' in str(elem.tag).lower():
+                        attrib = elem.attrib
+                        if attrib:
+                            for attr in [name for name in attrib.keys() if THEME_COLOR_ATTR_MATCH[name]]:
+                                del attrib[attr]
+
+                        if SHD_TAG_MATCH[elem.tag]:
                             elements_to_remove.append(elem)
 
-                    # Third pass: Remove marked elements using parent map
+                    # Remove marked elements through their lxml parent pointers
                     for elem in elements_to_remove:
-                        parent = parent_map.get(elem)
+                        parent = elem.getparent()
                         if parent is not None:
-                            try:
-                                parent.remove(elem)
-                            except:
-                                pass
+                            parent.remove(elem)
 
-                    tree.write(styles_xml, encoding='utf-8', xml_declaration=True)
+                    rewritten_parts[styles_xml] = etree.tostring(tree, encoding='utf-8', xml_declaration=True,
+                                                                 standalone=tree.docinfo.standalone)
                     print(f"  Neutralized styles.xml")
                 except Exception as e:
                     print(f"  Could not process styles.xml: {e}")
@@ -1365,418 +1776,192 @@ class FileBlinder:
                     traceback.print_exc()
 
             # Process main document
-            document_xml = temp_dir / 'word' / 'document.xml'
-            if document_xml.exists():
+            document_xml = 'word/document.xml'
+            if document_xml in names:
                 print("Processing main document XML...")
-                tree = ET.parse(document_xml)
-                root = tree.getroot()
+                print("Forcing all text to black color...")
 
-                # Build parent map for element removal
-                parent_map = {c: p for p in tree.iter() for c in p}
+                # lxml keeps parent pointers and the original namespace prefixes, so no parent map
+                # is needed and mc:Ignorable prefixes survive the round trip.
+                # The first pass runs while the part is parsed: iterparse streams it out of the zip
+                # and only reports the images/objects, shading and run properties, each once it is
+                # complete. Removals wait until parsing is done so the parser's tree stays intact.
+                elements_to_remove = []
+                with zip_in.open(document_xml) as part:
+                    parsed = etree.iterparse(part, events=('end',), tag=(W_DRAWING, W_OBJECT, W_SHD, W_R_PR),
+                                             **DOCX_PARSER_OPTIONS)
+                    for _, elem in parsed:
+                        tag = elem.tag
+                        if tag == W_R_PR:
+                            self._force_black_color(elem)
+                        else:
+                            # Drawing/object elements (images) and shading (table cells, rows, paragraphs)
+                            elements_to_remove.append(elem)
+                            if tag != W_SHD:
+                                images_removed += 1
 
-                # Remove drawing elements (images)
-                drawings_to_remove = root.findall('.//w:drawing', namespaces)
-                for drawing in drawings_to_remove:
-                    parent = parent_map.get(drawing)
-                    if parent is not None:
-                        parent.remove(drawing)
-                        images_removed += 1
+                    root = parsed.root
+                tree = root.getroottree()
 
-                # Remove object elements
-                objects_to_remove = root.findall('.//w:object', namespaces)
-                for obj in objects_to_remove:
-                    parent = parent_map.get(obj)
-                    if parent is not None:
-                        parent.remove(obj)
-                        images_removed += 1
-
-                # Remove all shading elements (table cells, rows, paragraphs)
-                shading_to_remove = root.findall('.//w:shd', namespaces)
-                for shd in shading_to_remove:
-                    parent = parent_map.get(shd)
+                for elem in elements_to_remove:
+                    parent = elem.getparent()
                     if parent is not None:
-                        try:
-                            parent.remove(shd)
-                        except:
-                            pass
-
-                # FORCE ALL TEXT TO BLACK COLOR
-                print("Forcing all text to black color...")
-                for rPr in root.findall('.//w:rPr', namespaces):
-                    # Find or create color element
-                    color_elem = rPr.find('w:color', namespaces)
-                    if color_elem is None:
-                        # Create new color element
-                        color_elem = ET.Element('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}color')
-                        rPr.insert(0, color_elem)
-
-                    # Set to black and remove theme color
-                    color_elem.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val', '000000')
-
-                    # Remove theme color attributes if they exist
-                    theme_color_attr = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeColor'
-                    theme_tint_attr = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeTint'
-                    theme_shade_attr = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeShade'
-
-                    if theme_color_attr in color_elem.attrib:
-                        del color_elem.attrib[theme_color_attr]
-                    if theme_tint_attr in color_elem.attrib:
-                        del color_elem.attrib[theme_tint_attr]
-                    if theme_shade_attr in color_elem.attrib:
-                        del color_elem.attrib[theme_shade_attr]
+                        parent.remove(elem)
+
+                # A second traversal over what is left replaces text in place and collects the
+                # content controls and hyperlinks, which are restructured once it has finished
+                sdts = []
+                hyperlinks = []
+                texts = []
+                for elem in root.iter(W_SDT, W_HYPERLINK, W_T):
+                    tag = elem.tag
+                    if tag == W_T:
+                        if elem.text:
+                            texts.append(elem)
+                    elif tag == W_SDT:
+                        sdts.append(elem)
+                    else:
+                        hyperlinks.append(elem)
+                text_replacements += self._replace_in_text_elements(texts)
 
                 # Remove content control (SDT) appearance/color properties AND BORDERS
                 print("Removing content control styling...")
-                for sdt in root.findall('.//w:sdt', namespaces):
+                # Per-element tracing goes to the debug log; the console only gets the summary
+                debug = self._debug and logger.isEnabledFor(logging.DEBUG)
+                sdts_cleaned = 0
+                for sdt in sdts:
+                    sdts_cleaned += 1
                     try:
-                        for sdtPr in sdt.findall('.//w:sdtPr', namespaces):
-                            # Build parent map for this subtree
-                            sdt_parent_map = {c: p for p in sdtPr.iter() for c in p}
-
+                        for sdtPr in sdt.iter(W_SDT_PR):
                             # REMOVE STYLE REFERENCES - this is what causes the blue background!
-                            print("  Resetting content control style...")
-                            # Remove run properties (character styles)
-                            for rPrElem in sdtPr.findall('.//w:rPr', namespaces):
-                                parent = sdt_parent_map.get(rPrElem, sdtPr)
-                                if parent is not None:
-                                    try:
-                                        parent.remove(rPrElem)
-                                        print("    Removed rPr (run properties/style) from SDT")
-                                    except:
-                                        pass
-
-                            # Remove paragraph properties (paragraph styles)
-                            for pPrElem in sdtPr.findall('.//w:pPr', namespaces):
-                                parent = sdt_parent_map.get(pPrElem, sdtPr)
-                                if parent is not None:
-                                    try:
-                                        parent.remove(pPrElem)
-                                        print("    Removed pPr (paragraph properties/style) from SDT")
-                                    except:
-                                        pass
-
-                            # Remove any direct children that are style-related
-                            direct_children_to_remove = []
+                            if debug:
+                                logger.debug("Resetting content control style")
+                            # Remove run and paragraph properties (character/paragraph styles);
+                            # the schema only allows them as direct children of sdtPr
                             for child in list(sdtPr):
-                                tag_lower = str(child.tag).lower()
-                                if 'rpr' in tag_lower or 'ppr' in tag_lower:
-                                    direct_children_to_remove.append(child)
-                                    print(f"    Marking style child for removal: {child.tag}")
-
-                            for child in direct_children_to_remove:
-                                try:
+                                if child.tag in STYLE_PR_TAGS:
                                     sdtPr.remove(child)
-                                    print(f"    Removed style child: {child.tag}")
-                                except:
-                                    pass
+                                    if debug:
+                                        logger.debug("Removed style child from SDT: %s", child.tag)
 
                             # SET appearance to hidden (removes border)
                             appearance_found = False
-                            for appearance in sdtPr.findall('.//w:appearance', namespaces):
+                            for appearance in sdtPr.iter(W_APPEARANCE):
                                 # Set appearance to "hidden" to remove border
-                                appearance.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val',
+                                appearance.set(W_VAL,
                                                'hidden')
                                 appearance_found = True
-                                print("    Set appearance to hidden")
+                                if debug:
+                                    logger.debug("Set appearance to hidden")
 
                             # If no appearance element exists, create one set to hidden
                             if not appearance_found:
-                                appearance_elem = ET.Element(
-                                    '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}appearance')
-                                appearance_elem.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val',
-                                                    'hidden')
-                                sdtPr.insert(0, appearance_elem)
-                                print("    Created hidden appearance")
+                                sdtPr.insert(0, sdtPr.makeelement(W_APPEARANCE, HIDDEN_APPEARANCE_ATTRIB))
+                                if debug:
+                                    logger.debug("Created hidden appearance")
 
                             # Remove color elements
-                            for color in sdtPr.findall('.//w:color', namespaces):
-                                parent = sdt_parent_map.get(color, sdtPr)
+                            for color in list(sdtPr.iter(W_COLOR)):
+                                parent = color.getparent()
                                 if parent is not None:
                                     try:
                                         parent.remove(color)
-                                    except:
+                                    except ValueError:
                                         pass
 
                             # Remove any shading in SDT properties
-                            for shd in sdtPr.findall('.//w:shd', namespaces):
-                                parent = sdt_parent_map.get(shd, sdtPr)
+                            for shd in list(sdtPr.iter(W_SHD)):
+                                parent = shd.getparent()
                                 if parent is not None:
                                     try:
                                         parent.remove(shd)
-                                    except:
+                                    except ValueError:
                                         pass
 
                             # Remove border-related elements more aggressively
                             all_children = list(sdtPr)
                             for child in all_children:
-                                tag_str = str(child.tag).lower()
-                                if any(x in tag_str for x in ['bdr', 'border']):
+                                if BORDER_TAG_MATCH[child.tag]:
                                     try:
                                         sdtPr.remove(child)
-                                    except:
+                                    except ValueError:
                                         pass
 
                         # NOW ALSO PROCESS THE CONTENT INSIDE THE SDT (sdtContent)
                         # This is where the paragraph style that causes the blue background lives!
-                        print("  Removing styles from content inside SDT...")
-                        for sdtContent in sdt.findall('.//w:sdtContent', namespaces):
+                        if debug:
+                            logger.debug("Removing styles from content inside SDT")
+                        for sdtContent in sdt.iter(W_SDT_CONTENT):
                             # Find all paragraphs inside the content
-                            for para in sdtContent.findall('.//w:p', namespaces):
+                            for para in sdtContent.iter(W_P):
                                 # Find paragraph properties
-                                for pPr in para.findall('.//w:pPr', namespaces):
+                                pPr = para.find(W_P_PR)
+                                if pPr is not None:
                                     # Remove paragraph style references (w:pStyle)
-                                    for pStyle in pPr.findall('.//w:pStyle', namespaces):
+                                    for pStyle in pPr.findall(W_P_STYLE):
                                         pPr.remove(pStyle)
-                                        print(f"    Removed paragraph style reference from content")
+                                        if debug:
+                                            logger.debug("Removed paragraph style reference from content")
 
                                     # Remove shading from paragraph
-                                    for shd in pPr.findall('.//w:shd', namespaces):
+                                    for shd in pPr.findall(W_SHD):
                                         pPr.remove(shd)
-                                        print(f"    Removed shading from paragraph")
+                                        if debug:
+                                            logger.debug("Removed shading from paragraph")
 
                                 # Also process runs inside these paragraphs
-                                for run in para.findall('.//w:r', namespaces):
-                                    for rPr in run.findall('.//w:rPr', namespaces):
+                                for run in para.iter(W_R):
+                                    for rPr in run.iter(W_R_PR):
                                         # Remove run style references (w:rStyle)
-                                        for rStyle in rPr.findall('.//w:rStyle', namespaces):
+                                        for rStyle in rPr.findall(W_R_STYLE):
                                             rPr.remove(rStyle)
-                                            print(f"    Removed run style reference from content")
+                                            if debug:
+                                                logger.debug("Removed run style reference from content")
 
                                         # Remove shading from runs
-                                        for shd in rPr.findall('.//w:shd', namespaces):
+                                        for shd in rPr.findall(W_SHD):
                                             rPr.remove(shd)
-                                            print(f"    Removed shading from run")
+                                            if debug:
+                                                logger.debug("Removed shading from run")
 
                     except Exception as e:
                         print(f"  Error processing SDT: {e}")
                         import traceback
                         traceback.print_exc()
 
+                print(f"  Cleaned styling on {sdts_cleaned} content controls")
+
                 # Remove hyperlinks while preserving text content
-                for hyperlink in root.findall('.//w:hyperlink', namespaces):
-                    parent = parent_map.get(hyperlink)
-                    if parent is not None:
-                        # Get the position of the hyperlink
-                        hyperlink_index = list(parent).index(hyperlink)
-
-                        # Move all children (runs) from hyperlink to parent
-                        # AND remove hyperlink formatting (blue color, underline)
-                        for i, child in enumerate(list(hyperlink)):
-                            # If this is a run (w:r), clean up its formatting
-                            if 'r' in str(child.tag).lower() and 'r' == str(child.tag).split('}')[-1]:
-                                # Find run properties
-                                for rPr in child.findall('w:rPr', namespaces):
-                                    # Remove underline
-                                    underline_elems = rPr.findall('w:u', namespaces)
-                                    for u_elem in underline_elems:
-                                        rPr.remove(u_elem)
-
-                                    # Force color to black and remove theme color
-                                    color_elem = rPr.find('w:color', namespaces)
-                                    if color_elem is None:
-                                        color_elem = ET.Element(
-                                            '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}color')
-                                        rPr.insert(0, color_elem)
-
-                                    color_elem.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val',
-                                                   '000000')
-
-                                    # Remove theme color attributes
-                                    for attr in [
-                                        '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeColor',
-                                        '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeTint',
-                                        '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeShade']:
-                                        if attr in color_elem.attrib:
-                                            del color_elem.attrib[attr]
-
-                            parent.insert(hyperlink_index + i, child)
-
-                        # Remove the hyperlink element
-                        parent.remove(hyperlink)
-                        hyperlinks_removed += 1
-
-                # Replace text in text elements
-                for text_elem in root.findall('.//w:t', namespaces):
-                    if text_elem.text:
-                        original_text = text_elem.text
-                        new_text = self.replace_keywords_in_text(original_text)
-                        if new_text != original_text:
-                            text_elem.text = new_text
-                            text_replacements += 1
+                hyperlinks_removed += self._unwrap_xml_hyperlinks(hyperlinks)
 
                 # Save the modified XML
-                tree.write(document_xml, encoding='utf-8', xml_declaration=True)
-
-            # Process headers
-            header_files = list((temp_dir / 'word').glob('header*.xml'))
-            for header_file in header_files:
-                print(f"Processing {header_file.name}...")
-                tree = ET.parse(header_file)
-                root = tree.getroot()
-
-                # Build parent map
-                parent_map = {c: p for p in tree.iter() for c in p}
-
-                # Remove images
-                for drawing in root.findall('.//w:drawing', namespaces):
-                    parent = parent_map.get(drawing)
-                    if parent is not None:
-                        parent.remove(drawing)
-                        images_removed += 1
-
-                # Remove all shading elements
-                for shd in root.findall('.//w:shd', namespaces):
-                    parent = parent_map.get(shd)
-                    if parent is not None:
-                        try:
-                            parent.remove(shd)
-                        except:
-                            pass
-
-                # FORCE ALL TEXT TO BLACK COLOR
-                for rPr in root.findall('.//w:rPr', namespaces):
-                    color_elem = rPr.find('w:color', namespaces)
-                    if color_elem is None:
-                        color_elem = ET.Element('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}color')
-                        rPr.insert(0, color_elem)
-                    color_elem.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val', '000000')
-                    # Remove theme attributes
-                    for attr in ['{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeColor',
-                                 '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeTint',
-                                 '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeShade']:
-                        if attr in color_elem.attrib:
-                            del color_elem.attrib[attr]
-
-                # Remove hyperlinks while preserving text
-                for hyperlink in root.findall('.//w:hyperlink', namespaces):
-                    parent = parent_map.get(hyperlink)
-                    if parent is not None:
-                        hyperlink_index = list(parent).index(hyperlink)
-                        # Clean up formatting in runs from hyperlinks
-                        for i, child in enumerate(list(hyperlink)):
-                            if 'r' in str(child.tag).lower() and 'r' == str(child.tag).split('}')[-1]:
-                                for rPr in child.findall('w:rPr', namespaces):
-                                    # Remove underline
-                                    for u_elem in rPr.findall('w:u', namespaces):
-                                        rPr.remove(u_elem)
-                                    # Force color to black
-                                    color_elem = rPr.find('w:color', namespaces)
-                                    if color_elem is None:
-                                        color_elem = ET.Element(
-                                            '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}color')
-                                        rPr.insert(0, color_elem)
-                                    color_elem.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val',
-                                                   '000000')
-                                    for attr in [
-                                        '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeColor',
-                                        '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeTint',
-                                        '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeShade']:
-                                        if attr in color_elem.attrib:
-                                            del color_elem.attrib[attr]
-                            parent.insert(hyperlink_index + i, child)
-                        parent.remove(hyperlink)
-                        hyperlinks_removed += 1
-
-                # Replace text
-                for text_elem in root.findall('.//w:t', namespaces):
-                    if text_elem.text:
-                        original_text = text_elem.text
-                        new_text = self.replace_keywords_in_text(original_text)
-                        if new_text != original_text:
-                            text_elem.text = new_text
-                            text_replacements += 1
-
-                tree.write(header_file, encoding='utf-8', xml_declaration=True)
-
-            # Process footers
-            footer_files = list((temp_dir / 'word').glob('footer*.xml'))
-            for footer_file in footer_files:
-                print(f"Processing {footer_file.name}...")
-                tree = ET.parse(footer_file)
-                root = tree.getroot()
-
-                # Build parent map
-                parent_map = {c: p for p in tree.iter() for c in p}
-
-                # Remove images
-                for drawing in root.findall('.//w:drawing', namespaces):
-                    parent = parent_map.get(drawing)
-                    if parent is not None:
-                        parent.remove(drawing)
-                        images_removed += 1
+                rewritten_parts[document_xml] = etree.tostring(tree, encoding='utf-8', xml_declaration=True,
+                                                               standalone=tree.docinfo.standalone)
 
-                # Remove all shading elements
-                for shd in root.findall('.//w:shd', namespaces):
-                    parent = parent_map.get(shd)
-                    if parent is not None:
-                        try:
-                            parent.remove(shd)
-                        except:
-                            pass
+            # Process headers and footers. Parts are handled one after another on purpose: document.xml dominates
+            # the work, each part takes milliseconds, and a process pool would spend longer starting
+            # workers and pickling the blinder (compiled patterns, automaton) than it could save.
+            for part in word_parts('word/header') + word_parts('word/footer'):
+                print(f"Processing {part.rsplit('/', 1)[-1]}...")
+                tree = etree.fromstring(zip_in.read(part), DOCX_PARSER).getroottree()
 
-                # FORCE ALL TEXT TO BLACK COLOR
-                for rPr in root.findall('.//w:rPr', namespaces):
-                    color_elem = rPr.find('w:color', namespaces)
-                    if color_elem is None:
-                        color_elem = ET.Element('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}color')
-                        rPr.insert(0, color_elem)
-                    color_elem.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val', '000000')
-                    # Remove theme attributes
-                    for attr in ['{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeColor',
-                                 '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeTint',
-                                 '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeShade']:
-                        if attr in color_elem.attrib:
-                            del color_elem.attrib[attr]
-
-                # Remove hyperlinks while preserving text
-                for hyperlink in root.findall('.//w:hyperlink', namespaces):
-                    parent = parent_map.get(hyperlink)
-                    if parent is not None:
-                        hyperlink_index = list(parent).index(hyperlink)
-                        # Clean up formatting in runs from hyperlinks
-                        for i, child in enumerate(list(hyperlink)):
-                            if 'r' in str(child.tag).lower() and 'r' == str(child.tag).split('}')[-1]:
-                                for rPr in child.findall('w:rPr', namespaces):
-                                    # Remove underline
-                                    for u_elem in rPr.findall('w:u', namespaces):
-                                        rPr.remove(u_elem)
-                                    # Force color to black
-                                    color_elem = rPr.find('w:color', namespaces)
-                                    if color_elem is None:
-                                        color_elem = ET.Element(
-                                            '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}color')
-                                        rPr.insert(0, color_elem)
-                                    color_elem.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val',
-                                                   '000000')
-                                    for attr in [
-                                        '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeColor',
-                                        '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeTint',
-                                        '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeShade']:
-                                        if attr in color_elem.attrib:
-                                            del color_elem.attrib[attr]
-                            parent.insert(hyperlink_index + i, child)
-                        parent.remove(hyperlink)
-                        hyperlinks_removed += 1
-
-                # Replace text
-                for text_elem in root.findall('.//w:t', namespaces):
-                    if text_elem.text:
-                        original_text = text_elem.text
-                        new_text = self.replace_keywords_in_text(original_text)
-                        if new_text != original_text:
-                            text_elem.text = new_text
-                            text_replacements += 1
+                part_images, part_hyperlinks, part_replacements = self._clean_header_footer_xml(tree.getroot())
+                images_removed += part_images
+                hyperlinks_removed += part_hyperlinks
+                text_replacements += part_replacements
 
-                tree.write(footer_file, encoding='utf-8', xml_declaration=True)
+                rewritten_parts[part] = etree.tostring(tree, encoding='utf-8', xml_declaration=True,
+                                                       standalone=tree.docinfo.standalone)
 
             # Recreate the DOCX file
             print("Rebuilding DOCX file...")
             with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zip_out:
-                for file_path in temp_dir.rglob('*'):
-                    if file_path.is_file():
-                        # Calculate the path within the zip
-                        arc_path = file_path.relative_to(temp_dir)
-                        zip_out.write(file_path, arc_path)
+                for info in zip_in.infolist():
+                    data = rewritten_parts.get(info.filename)
+                    if data is None:
+                        data = zip_in.read(info)
+                    info.compress_type = self._zip_compress_type(info.filename)
+                    zip_out.writestr(info, data)
 
             print(f"✓ Removed {images_removed} images/objects")
             print(f"✓ Removed {hyperlinks_removed} hyperlinks (text preserved)")
@@ -1793,6 +1978,9 @@ class FileBlinder:
         print("STEP 0: Simple Selective Image Removal (Before Processing)")
         print("=" * 70)
 
+        # Per-file and per-relationship tracing goes to the debug log; the console gets totals
+        debug = self._debug and logger.isEnabledFor(logging.DEBUG)
+
         # If no selection, remove all images
         if not self.image_hashes_to_remove:
             print("  No image selection - will remove ALL images")
@@ -1801,44 +1989,43 @@ class FileBlinder:
             print(f"  Will remove {len(self.image_hashes_to_remove)} selected images")
             remove_all = False
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_dir = Path(temp_dir)
-
-            # Extract DOCX
-            print("  Extracting DOCX...")
-            with zipfile.ZipFile(docx_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
+        # The package is read in place: only the parts that change are rewritten, deleted media is
+        # skipped and every other entry is copied across without touching the disk in between
+        with zipfile.ZipFile(docx_path, 'r') as zip_in:
+            names = zip_in.namelist()
 
-            namespaces = {
-                'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-                'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
-            }
+            def word_parts(prefix, suffix='.xml'):
+                """Names of the parts directly under prefix's folder whose path starts with prefix"""
+                return [name for name in names
+                        if name.startswith(prefix) and name.endswith(suffix) and name.count('/') == prefix.count('/')]
 
-            ET.register_namespace('w', 'http://schemas.openxmlformats.org/wordprocessingml/2006/main')
-            ET.register_namespace('r', 'http://schemas.openxmlformats.org/officeDocument/2006/relationships')
-            ET.register_namespace('', 'http://schemas.openxmlformats.org/package/2006/relationships')
+            ET.register_namespace('w', W_NS)
+            ET.register_namespace('r', R_NS)
+            ET.register_namespace('', REL_NS)
 
             # 1. Build map of media files to their hashes
             print("\n1. Analyzing media files...")
-            media_dir = temp_dir / 'word' / 'media'
+            media_parts = word_parts('word/media/', '')
             images_to_remove = set()  # filenames to remove
 
-            if media_dir.exists():
-                for media_file in media_dir.iterdir():
-                    if media_file.is_file():
-                        try:
-                            with open(media_file, 'rb') as f:
-                                image_data = f.read()
-                                image_hash = self.calculate_image_hash(image_data)
-
-                                # Check if this image should be removed
-                                if remove_all or image_hash in self.image_hashes_to_remove:
-                                    images_to_remove.add(media_file.name)
-                                    print(f"    ✓ Marked for removal: {media_file.name}")
-                                else:
-                                    print(f"    ○ Keeping: {media_file.name}")
-                        except Exception as e:
-                            print(f"    ✗ Error analyzing {media_file.name}: {e}")
+            if remove_all:
+                # Nothing to compare against, so skip hashing entirely
+                for name in media_parts:
+                    images_to_remove.add(name.rsplit('/', 1)[-1])
+                    if debug:
+                        logger.debug("Marked for removal: %s", name)
+            else:
+                for name, image_hash, error in self._hash_media_parts(zip_in, media_parts):
+                    filename = name.rsplit('/', 1)[-1]
+                    if error is not None:
+                        print(f"    ✗ Error analyzing {filename}: {error}")
+                    elif image_hash in self.image_hashes_to_remove:
+                        images_to_remove.add(filename)
+                        if debug:
+                            logger.debug("Marked for removal: %s", filename)
+                    else:
+                        if debug:
+                            logger.debug("Keeping: %s", filename)
 
             print(f"  Total images to remove: {len(images_to_remove)}")
 
@@ -1846,64 +2033,59 @@ class FileBlinder:
                 print("  No images to remove - returning original file")
                 return docx_path
 
-            # 2. Find relationship IDs for images to remove
+            # 2. Find relationship IDs for images to remove; each rels part is parsed once and
+            # kept for step 4
             print("\n2. Finding relationship IDs...")
             rel_ids_to_remove = set()
+            rels_roots = {}
 
-            rels_dir = temp_dir / 'word' / '_rels'
-            if rels_dir.exists():
-                for rels_file in rels_dir.glob('*.xml.rels'):
-                    try:
-                        tree = ET.parse(rels_file)
-                        root = tree.getroot()
-
-                        for rel in root.findall(
-                                './/{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'):
-                            target = rel.get('Target', '')
-                            if 'media/' in target:
-                                filename = Path(target).name
-                                if filename in images_to_remove:
-                                    rel_id = rel.get('Id')
-                                    rel_ids_to_remove.add(rel_id)
-                                    print(f"    Found: {filename} -> {rel_id}")
-                    except Exception as e:
-                        print(f"    Warning: Error reading {rels_file.name}: {e}")
+            for rels_part in word_parts('word/_rels/', '.xml.rels'):
+                try:
+                    root = ET.fromstring(zip_in.read(rels_part))
+                    rels_roots[rels_part] = root
+
+                    for rel in root.findall(
+                            './/{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'):
+                        target = rel.get('Target', '')
+                        if 'media/' in target:
+                            filename = Path(target).name
+                            if filename in images_to_remove:
+                                rel_id = rel.get('Id')
+                                rel_ids_to_remove.add(rel_id)
+                                if debug:
+                                    logger.debug("Found: %s -> %s", filename, rel_id)
+                except Exception as e:
+                    print(f"    Warning: Error reading {rels_part.rsplit('/', 1)[-1]}: {e}")
+            print(f"  Found {len(rel_ids_to_remove)} image relationships")
 
             print(f"  Total relationship IDs to remove: {len(rel_ids_to_remove)}")
 
             # 3. Remove image runs from XML files
             print("\n3. Removing image runs from documents...")
+            rewritten_parts = {}
 
-            def remove_selected_image_runs(xml_file):
-                if not xml_file.exists():
-                    return 0
-
+            def remove_selected_image_runs(xml_part):
+                xml_name = xml_part.rsplit('/', 1)[-1]
                 try:
-                    tree = ET.parse(xml_file)
-                    root = tree.getroot()
-                    parent_map = {c: p for p in tree.iter() for c in p}
+                    root = ET.fromstring(zip_in.read(xml_part))
+                    parent_map = {c: p for p in root.iter() for c in p}
 
                     runs_removed = 0
                     runs_to_remove = []
 
                     # Find runs that contain images we want to remove
-                    for run in root.findall('.//w:r', namespaces):
+                    for run in root.iter(W_R):
                         should_remove = False
 
                         # Check if this run contains an image
                         for child in run.iter():
-                            tag = str(child.tag).lower()
-                            if any(img_tag in tag for img_tag in ['drawing', 'pict', 'object', 'picture']):
+                            if child.tag in IMAGE_TAGS:
                                 # Check if this specific image should be removed
                                 # Look for the relationship ID
-                                for blip in child.iter():
-                                    if 'blip' in str(blip.tag).lower():
-                                        embed_attr = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed'
-                                        if embed_attr in blip.attrib:
-                                            rel_id = blip.attrib[embed_attr]
-                                            if rel_id in rel_ids_to_remove:
-                                                should_remove = True
-                                                break
+                                for blip in child.iter(A_BLIP):
+                                    if blip.get(R_EMBED) in rel_ids_to_remove:
+                                        should_remove = True
+                                        break
 
                                 # If removing all, or if we found a matching rel_id
                                 if should_remove:
@@ -1920,69 +2102,56 @@ class FileBlinder:
                             runs_removed += 1
 
                     if runs_removed > 0:
-                        tree.write(xml_file, encoding='utf-8', xml_declaration=True)
-                        print(f"    ✓ Removed {runs_removed} image runs from {xml_file.name}")
+                        rewritten_parts[xml_part] = ET.tostring(root, encoding='utf-8', xml_declaration=True)
+                        print(f"    ✓ Removed {runs_removed} image runs from {xml_name}")
 
                     return runs_removed
                 except Exception as e:
-                    print(f"    ✗ Error processing {xml_file.name}: {e}")
+                    print(f"    ✗ Error processing {xml_name}: {e}")
                     return 0
 
             total_runs_removed = 0
 
             # Process main document
-            doc_xml = temp_dir / 'word' / 'document.xml'
-            total_runs_removed += remove_selected_image_runs(doc_xml)
+            if 'word/document.xml' in names:
+                total_runs_removed += remove_selected_image_runs('word/document.xml')
 
             # Process headers
-            for header_file in (temp_dir / 'word').glob('header*.xml'):
-                total_runs_removed += remove_selected_image_runs(header_file)
+            for header_part in word_parts('word/header'):
+                total_runs_removed += remove_selected_image_runs(header_part)
 
             # Process footers
-            for footer_file in (temp_dir / 'word').glob('footer*.xml'):
-                total_runs_removed += remove_selected_image_runs(footer_file)
+            for footer_part in word_parts('word/footer'):
+                total_runs_removed += remove_selected_image_runs(footer_part)
 
             # 4. Clean relationships
             print("\n4. Cleaning relationships...")
             rels_cleaned = 0
 
-            if rels_dir.exists():
-                for rels_file in rels_dir.glob('*.xml.rels'):
-                    try:
-                        tree = ET.parse(rels_file)
-                        root = tree.getroot()
-
-                        rels_to_remove_list = []
-                        for rel in root.findall(
-                                './/{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'):
-                            rel_id = rel.get('Id')
-                            if rel_id in rel_ids_to_remove:
-                                rels_to_remove_list.append(rel)
+            for rels_part, root in rels_roots.items():
+                try:
+                    rels_to_remove_list = []
+                    for rel in root.findall(
+                            './/{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'):
+                        rel_id = rel.get('Id')
+                        if rel_id in rel_ids_to_remove:
+                            rels_to_remove_list.append(rel)
 
-                        for rel in rels_to_remove_list:
-                            root.remove(rel)
-                            rels_cleaned += 1
+                    for rel in rels_to_remove_list:
+                        root.remove(rel)
+                        rels_cleaned += 1
 
-                        if rels_to_remove_list:
-                            tree.write(rels_file, encoding='utf-8', xml_declaration=True)
-                    except Exception as e:
-                        print(f"    Warning: Error cleaning {rels_file.name}: {e}")
+                    if rels_to_remove_list:
+                        rewritten_parts[rels_part] = ET.tostring(root, encoding='utf-8', xml_declaration=True)
+                except Exception as e:
+                    print(f"    Warning: Error cleaning {rels_part.rsplit('/', 1)[-1]}: {e}")
 
             print(f"    ✓ Cleaned {rels_cleaned} relationships")
 
-            # 5. Delete physical image files
+            # 5. Physical image files are dropped while the package is rebuilt
             print("\n5. Deleting physical media files...")
-            files_deleted = 0
-
-            if media_dir.exists():
-                for filename in images_to_remove:
-                    image_file = media_dir / filename
-                    if image_file.exists():
-                        try:
-                            image_file.unlink()
-                            files_deleted += 1
-                        except Exception as e:
-                            print(f"    Warning: Could not delete {filename}: {e}")
+            deleted_parts = {name for name in media_parts if name.rsplit('/', 1)[-1] in images_to_remove}
+            files_deleted = len(deleted_parts)
 
             print(f"    ✓ Deleted {files_deleted} media files")
 
@@ -1991,10 +2160,14 @@ class FileBlinder:
             output_temp = docx_path.parent / f"{docx_path.stem}_temp_no_selected_images.docx"
 
             with zipfile.ZipFile(output_temp, 'w', zipfile.ZIP_DEFLATED) as zip_out:
-                for file_path in temp_dir.rglob('*'):
-                    if file_path.is_file():
-                        arc_path = file_path.relative_to(temp_dir)
-                        zip_out.write(file_path, arc_path)
+                for info in zip_in.infolist():
+                    if info.filename in deleted_parts:
+                        continue
+                    data = rewritten_parts.get(info.filename)
+                    if data is None:
+                        data = zip_in.read(info)
+                    info.compress_type = self._zip_compress_type(info.filename)
+                    zip_out.writestr(info, data)
 
             print(f"\n{'=' * 70}")
             print("✅ SELECTIVE IMAGE REMOVAL COMPLETE")
@@ -2011,11 +2184,17 @@ class FileBlinder:
         Process DOCX with selective image removal AND complete formatting standardization.
         Includes processing of headers/footers for image removal.
         """
+        if not LXML_AVAILABLE:
+            raise ImportError("lxml not installed. Run: pip install lxml")
+
         print("=" * 70)
         print("SELECTIVE MODE - Image Selection + Complete Formatting Cleanup")
         print("=" * 70)
         print()
 
+        # Per-file and per-relationship tracing goes to the debug log; the console gets totals
+        debug = self._debug and logger.isEnabledFor(logging.DEBUG)
+
         if self.image_hashes_to_remove:
             print(f"Will remove {len(self.image_hashes_to_remove)} selected images")
         else:
@@ -2031,11 +2210,11 @@ class FileBlinder:
                 zip_ref.extractall(temp_dir)
 
             namespaces = {
-                'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-                'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
-                'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
-                'v': 'urn:schemas-microsoft-com:vml',
-                'o': 'urn:schemas-microsoft-com:office:office'
+                'w': W_NS,
+                'r': R_NS,
+                'rel': REL_NS,
+                'v': V_NS,
+                'o': O_NS
             }
 
             for prefix, uri in namespaces.items():
@@ -2048,21 +2227,20 @@ class FileBlinder:
             images_to_remove = set()
 
             if media_dir.exists():
-                for media_file in media_dir.iterdir():
-                    if media_file.is_file():
-                        try:
-                            with open(media_file, 'rb') as f:
-                                image_data = f.read()
-                                image_hash = self.calculate_image_hash(image_data)
-                                image_hash_map[media_file.name] = image_hash
-
-                                if self.should_remove_image(image_data):
-                                    images_to_remove.add(media_file.name)
-                                    print(f"    ✓ Marked for removal: {media_file.name}")
-                                else:
-                                    print(f"    ○ Keeping: {media_file.name}")
-                        except Exception as e:
-                            print(f"    ✗ Error: {e}")
+                for media_file, image_hash, error in self._hash_media_files(media_dir):
+                    if error is not None:
+                        print(f"    ✗ Error: {error}")
+                        continue
+                    image_hash_map[media_file.name] = image_hash
+
+                    # Same rule as should_remove_image, reusing the hash computed above
+                    if not self.image_hashes_to_remove or image_hash in self.image_hashes_to_remove:
+                        images_to_remove.add(media_file.name)
+                        if debug:
+                            logger.debug("Marked for removal: %s", media_file.name)
+                    else:
+                        if debug:
+                            logger.debug("Keeping: %s", media_file.name)
 
             print(f"  Total images to remove: {len(images_to_remove)}\n")
 
@@ -2085,7 +2263,8 @@ class FileBlinder:
                         if filename in images_to_remove:
                             rel_id = rel.get('Id')
                             rel_ids_to_remove.add(rel_id)
-                            print(f"    Found in document.xml.rels: {filename} -> {rel_id}")
+                            if debug:
+                                logger.debug("Found in document.xml.rels: %s -> %s", filename, rel_id)
 
             # Process header/footer relationships
             rels_dir = temp_dir / 'word' / '_rels'
@@ -2107,12 +2286,14 @@ class FileBlinder:
                                     rel_id = rel.get('Id')
                                     rel_ids_to_remove.add(rel_id)
                                     has_images = True
-                                    print(f"    Found in {rels_file.name}: {filename} -> {rel_id}")
+                                    if debug:
+                                        logger.debug("Found in %s: %s -> %s", rels_file.name, filename, rel_id)
 
                         if has_images:
                             rels_files_to_update.append(rels_file)
                     except Exception as e:
                         print(f"    Warning: Could not process {rels_file.name}: {e}")
+            print(f"  Found {len(rel_ids_to_remove)} image relationships")
 
             print(f"  Total relationship IDs to remove: {len(rel_ids_to_remove)}\n")
 
@@ -2133,7 +2314,7 @@ class FileBlinder:
                             rels_removed += 1
 
                     if rels_removed > 0:
-                        tree.write(rels_file_path, encoding='utf-8', xml_declaration=True)
+                        rels_file_path.write_bytes(ET.tostring(root, encoding='utf-8', xml_declaration=True))
                         print(f"    ✓ Removed {rels_removed} relationships from {rels_file_path.name}")
 
                 except Exception as e:
@@ -2146,51 +2327,25 @@ class FileBlinder:
                 drawings_found = 0
 
                 # Find all runs (w:r elements)
-                for run in root.findall('.//w:r', namespaces):
+                for run in root.iter(W_R):
                     should_remove_run = False
 
-                    # Check for drawings (modern format)
-                    for drawing in run.findall('.//w:drawing', namespaces):
-                        for blip in drawing.iter():
-                            if 'blip' in str(blip.tag).lower():
-                                embed_attr = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed'
-                                if embed_attr in blip.attrib:
-                                    rel_id = blip.attrib[embed_attr]
-                                    if rel_id in rel_ids_to_remove:
-                                        should_remove_run = True
-                                        drawings_found += 1
-                                        break
-                        if should_remove_run:
+                    # Check drawings (modern format), pictures (older w:pict format) and embedded
+                    # objects in one walk of the run
+                    for media in run.iter():
+                        tag = media.tag
+                        if tag not in IMAGE_TAGS:
+                            continue
+                        # Generators, so any() stops at the first matching relationship
+                        if tag == W_DRAWING:
+                            rel_ids = (blip.get(R_EMBED) for blip in media.iter(A_BLIP))
+                        else:
+                            rel_ids = (elem.get(R_ID) for elem in media.iter(V_IMAGEDATA))
+                        if any(rel_id and rel_id in rel_ids_to_remove for rel_id in rel_ids):
+                            should_remove_run = True
+                            drawings_found += 1
                             break
 
-                    # Check for pictures (older format - w:pict)
-                    if not should_remove_run:
-                        for pict in run.findall('.//w:pict', namespaces):
-                            for elem in pict.iter():
-                                if 'imagedata' in str(elem.tag).lower():
-                                    rel_id = elem.get(
-                                        '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id')
-                                    if rel_id and rel_id in rel_ids_to_remove:
-                                        should_remove_run = True
-                                        drawings_found += 1
-                                        break
-                            if should_remove_run:
-                                break
-
-                    # Check for objects (embedded objects)
-                    if not should_remove_run:
-                        for obj in run.findall('.//w:object', namespaces):
-                            for elem in obj.iter():
-                                if 'imagedata' in str(elem.tag).lower():
-                                    rel_id = elem.get(
-                                        '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id')
-                                    if rel_id and rel_id in rel_ids_to_remove:
-                                        should_remove_run = True
-                                        drawings_found += 1
-                                        break
-                            if should_remove_run:
-                                break
-
                     if should_remove_run:
                         runs_to_remove.append(run)
 
@@ -2224,55 +2379,38 @@ class FileBlinder:
                 parent_map = {c: p for p in tree.iter() for c in p}
 
                 # 1. REMOVE CONTENT CONTROLS (blue boxes)
-                for sdt in root.findall('.//w:sdt', namespaces):
+                for sdt in list(root.iter(W_SDT)):
                     parent = parent_map.get(sdt)
                     if parent is not None:
                         sdt_index = list(parent).index(sdt)
-                        sdt_content = sdt.find('.//w:sdtContent', namespaces)
+                        sdt_content = sdt.find(W_SDT_CONTENT)
                         if sdt_content is not None:
-                            for child in list(sdt_content):
-                                parent.insert(sdt_index, child)
-                                sdt_index += 1
+                            parent[sdt_index:sdt_index] = list(sdt_content)
                         parent.remove(sdt)
                         sdts_removed += 1
 
                 # 2. REMOVE ALL PARAGRAPH STYLES (force to Normal)
-                for para in root.findall('.//w:p', namespaces):
-                    for pPr in para.findall('.//w:pPr', namespaces):
-                        for pStyle in pPr.findall('.//w:pStyle', namespaces):
+                for para in root.iter(W_P):
+                    pPr = para.find(W_P_PR)
+                    if pPr is not None:
+                        for pStyle in pPr.findall(W_P_STYLE):
                             pPr.remove(pStyle)
                             styles_removed += 1
 
                 # 3. FORCE ALL TEXT TO BLACK
-                for rPr in root.findall('.//w:rPr', namespaces):
-                    # Remove existing color elements
-                    for color_elem in list(rPr):
-                        if 'color' in str(color_elem.tag).lower() or 'highlight' in str(color_elem.tag).lower():
-                            rPr.remove(color_elem)
-
-                    # Add black color
-                    color_elem = ET.Element('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}color')
-                    color_elem.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val', '000000')
-
-                    # Remove theme attributes
-                    for attr in ['{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeColor',
-                                 '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeTint',
-                                 '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeShade']:
-                        if attr in color_elem.attrib:
-                            del color_elem.attrib[attr]
-
-                    rPr.insert(0, color_elem)
+                for rPr in root.iter(W_R_PR):
+                    self._replace_run_color(rPr)
                     colors_forced += 1
 
                 # 4. REMOVE ALL SHADING
-                for shd in root.findall('.//w:shd', namespaces):
+                for shd in list(root.iter(W_SHD)):
                     parent = parent_map.get(shd)
                     if parent is not None:
                         parent.remove(shd)
                         shading_removed += 1
 
                 # 5. REMOVE ALL BORDERS
-                for pBdr in root.findall('.//w:pBdr', namespaces):
+                for pBdr in list(root.iter(W_P_BDR)):
                     parent = parent_map.get(pBdr)
                     if parent is not None:
                         parent.remove(pBdr)
@@ -2286,16 +2424,15 @@ class FileBlinder:
                 print(f"    ✓ Removed {runs_removed} runs containing {drawings_found} images from document.xml")
 
                 # 7. REPLACE KEYWORDS
-                for text_elem in root.findall('.//w:t', namespaces):
+                for text_elem in root.iter(W_T):
                     if text_elem.text:
-                        original = text_elem.text
-                        new_text = self.replace_keywords_in_text(original)
-                        if new_text != original:
+                        new_text, found = self._replace_keywords_counted(text_elem.text)
+                        if found:
                             text_elem.text = new_text
                             text_replacements += 1
 
                 # NOW save everything at once
-                tree.write(document_xml, encoding='utf-8', xml_declaration=True)
+                document_xml.write_bytes(ET.tostring(root, encoding='utf-8', xml_declaration=True))
 
                 print(f"    ✓ Removed {sdts_removed} content controls")
                 print(f"    ✓ Removed {styles_removed} paragraph styles")
@@ -2320,45 +2457,31 @@ class FileBlinder:
 
                     # Force all text to black (same as document)
                     colors_forced = 0
-                    for rPr in root.findall('.//w:rPr', namespaces):
-                        # Remove existing color elements
-                        for color_elem in list(rPr):
-                            if 'color' in str(color_elem.tag).lower() or 'highlight' in str(color_elem.tag).lower():
-                                rPr.remove(color_elem)
-
-                        # Add black color
-                        color_elem = ET.Element('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}color')
-                        color_elem.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val', '000000')
-
-                        for attr in ['{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeColor',
-                                     '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeTint',
-                                     '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}themeShade']:
-                            if attr in color_elem.attrib:
-                                del color_elem.attrib[attr]
-
-                        rPr.insert(0, color_elem)
+                    for rPr in root.iter(W_R_PR):
+                        self._replace_run_color(rPr)
                         colors_forced += 1
 
                     # Remove paragraph styles
                     styles_removed = 0
                     parent_map = {c: p for p in tree.iter() for c in p}
-                    for para in root.findall('.//w:p', namespaces):
-                        for pPr in para.findall('.//w:pPr', namespaces):
-                            for pStyle in pPr.findall('.//w:pStyle', namespaces):
+                    for para in root.iter(W_P):
+                        pPr = para.find(W_P_PR)
+                        if pPr is not None:
+                            for pStyle in pPr.findall(W_P_STYLE):
                                 pPr.remove(pStyle)
                                 styles_removed += 1
 
                     # Remove shading
                     shading_removed = 0
                     parent_map = {c: p for p in tree.iter() for c in p}
-                    for shd in root.findall('.//w:shd', namespaces):
+                    for shd in list(root.iter(W_SHD)):
                         parent = parent_map.get(shd)
                         if parent is not None:
                             parent.remove(shd)
                             shading_removed += 1
 
                     if runs_removed > 0 or colors_forced > 0 or styles_removed > 0 or shading_removed > 0:
-                        tree.write(xml_path, encoding='utf-8', xml_declaration=True)
+                        xml_path.write_bytes(ET.tostring(root, encoding='utf-8', xml_declaration=True))
                         print(
                             f"    ✓ Processed {xml_name}: {runs_removed} image runs, {colors_forced} colors, {styles_removed} styles, {shading_removed} shading")
 
@@ -2391,16 +2514,10 @@ class FileBlinder:
             if theme_dir.exists():
                 for theme_file in theme_dir.glob('*.xml'):
                     try:
-                        tree = ET.parse(theme_file)
-                        root = tree.getroot()
-                        for element in root.iter():
-                            if 'srgbClr' in str(element.tag):
-                                element.set('val', '000000')
-                            elif 'sysClr' in str(element.tag):
-                                element.set('val', 'windowText')
-                                element.set('lastClr', '000000')
-                        tree.write(theme_file, encoding='utf-8', xml_declaration=True)
-                    except:
+                        data = self._neutralize_theme_part(theme_file.read_bytes(), FIND_THEME_COLORS)
+                        if data is not None:
+                            theme_file.write_bytes(data)
+                    except (etree.XMLSyntaxError, OSError):
                         pass
 
             # Neutralize styles.xml
@@ -2413,7 +2530,7 @@ class FileBlinder:
 
                 elements_to_remove = []
                 for elem in root.iter():
-                    if 'color' in str(elem.tag).lower() or 'shd' in str(elem.tag).lower():
+                    if COLOR_SHD_TAG_MATCH[elem.tag]:
                         elements_to_remove.append(elem)
 
                 for elem in elements_to_remove:
@@ -2421,93 +2538,96 @@ class FileBlinder:
                     if parent is not None:
                         try:
                             parent.remove(elem)
-                        except:
+                        except ValueError:
                             pass
 
-                tree.write(styles_xml, encoding='utf-8', xml_declaration=True)
+                styles_xml.write_bytes(ET.tostring(root, encoding='utf-8', xml_declaration=True))
 
-            # Save to temp file WITHOUT deleting images yet
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_preprocessed:
-                preprocessed_path = tmp_preprocessed.name
+            # Save to an in-memory package WITHOUT deleting images yet
+            preprocessed = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
 
-            with zipfile.ZipFile(preprocessed_path, 'w', zipfile.ZIP_DEFLATED) as zip_out:
+            with zipfile.ZipFile(preprocessed, 'w', zipfile.ZIP_DEFLATED) as zip_out:
                 for file_path in temp_dir.rglob('*'):
                     if file_path.is_file():
                         arc_path = file_path.relative_to(temp_dir)
-                        zip_out.write(file_path, arc_path)
+                        zip_out.write(file_path, arc_path, self._zip_compress_type(file_path.name))
 
         # PHASE 2: Python-docx processing for remaining cleanup
         print("\nPhase 2: Processing with python-docx for final cleanup...")
 
         if not DOCX_AVAILABLE:
             print("  python-docx not available, skipping to final cleanup...")
-            temp_output = preprocessed_path
+            temp_output = preprocessed
         else:
             try:
-                doc = Document(preprocessed_path)
+                preprocessed.seek(0)
+                doc = Document(preprocessed)
+                try:
+                    normal_style = doc.styles['Normal']
+                except KeyError:
+                    normal_style = None
 
                 # Process all paragraphs
                 for para in doc.paragraphs:
                     try:
-                        if para.style.name != 'Normal':
-                            para.style = doc.styles['Normal']
-                    except:
+                        if normal_style is not None and para.style.name != 'Normal':
+                            para.style = normal_style
+                    except XML_EDIT_ERRORS:
                         pass
 
                     for run in para.runs:
                         self.standardize_run_formatting(run)
 
+                # Remove table shading in one walk per table
+                tables = doc.tables
+                for table in tables:
+                    self._sanitize_table_shading(table._tbl)
+
                 # Process tables
-                for table in doc.tables:
+                for table in tables:
                     for row in table.rows:
-                        self.remove_table_row_shading(row)
                         for cell in row.cells:
-                            self.remove_table_cell_shading(cell)
                             for paragraph in cell.paragraphs:
                                 try:
-                                    if paragraph.style.name != 'Normal':
-                                        paragraph.style = doc.styles['Normal']
-                                except:
+                                    if normal_style is not None and paragraph.style.name != 'Normal':
+                                        paragraph.style = normal_style
+                                except XML_EDIT_ERRORS:
                                     pass
                                 for run in paragraph.runs:
                                     self.standardize_run_formatting(run)
 
-                # Process headers/footers
+                # Process headers/footers, skipping linked ones (see process_docx_safe)
                 for section in doc.sections:
-                    if section.header:
-                        for paragraph in section.header.paragraphs:
+                    header = section.header
+                    if not header.is_linked_to_previous:
+                        for paragraph in header.paragraphs:
                             try:
-                                if paragraph.style.name != 'Normal':
-                                    paragraph.style = doc.styles['Normal']
-                            except:
+                                if normal_style is not None and paragraph.style.name != 'Normal':
+                                    paragraph.style = normal_style
+                            except XML_EDIT_ERRORS:
                                 pass
                             for run in paragraph.runs:
                                 self.standardize_run_formatting(run)
 
-                    if section.footer:
-                        for paragraph in section.footer.paragraphs:
+                    footer = section.footer
+                    if not footer.is_linked_to_previous:
+                        for paragraph in footer.paragraphs:
                             try:
-                                if paragraph.style.name != 'Normal':
-                                    paragraph.style = doc.styles['Normal']
-                            except:
+                                if normal_style is not None and paragraph.style.name != 'Normal':
+                                    paragraph.style = normal_style
+                            except XML_EDIT_ERRORS:
                                 pass
                             for run in paragraph.runs:
                                 self.standardize_run_formatting(run)
 
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp_phase2:
-                    temp_output = tmp_phase2.name
-
+                temp_output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
                 doc.save(temp_output)
-
-                try:
-                    os.unlink(preprocessed_path)
-                except:
-                    pass
+                preprocessed.close()
 
             except Exception as e:
                 print(f"  Warning: python-docx processing failed: {e}")
                 print("  Continuing with phase 1 output...")
-                temp_output = preprocessed_path
+                temp_output = preprocessed
 
         # PHASE 3: Final cleanup - NOW remove the physical image files
         print("\nPhase 3: Final cleanup - removing physical image files...")
@@ -2515,6 +2635,7 @@ class FileBlinder:
         with tempfile.TemporaryDirectory() as final_temp_dir:
             final_temp_dir = Path(final_temp_dir)
 
+            temp_output.seek(0)
             with zipfile.ZipFile(temp_output, 'r') as zip_ref:
                 zip_ref.extractall(final_temp_dir)
 
@@ -2538,13 +2659,9 @@ class FileBlinder:
                 for file_path in final_temp_dir.rglob('*'):
                     if file_path.is_file():
                         arc_path = file_path.relative_to(final_temp_dir)
-                        zip_out.write(file_path, arc_path)
+                        zip_out.write(file_path, arc_path, self._zip_compress_type(file_path.name))
 
-        # Clean up temp file
-        try:
-            os.unlink(temp_output)
-        except:
-            pass
+        temp_output.close()
 
         print(f"\n{'=' * 70}")
         print("✅ PROCESSING COMPLETE")
@@ -2567,10 +2684,10 @@ class FileBlinder:
         if not HTML_AVAILABLE:
             raise ImportError("beautifulsoup4 not installed. Run: pip install beautifulsoup4")
 
-        with open(input_path, 'r', encoding='utf-8') as file:
+        with open(input_path, 'rb') as file:
             content = file.read()
 
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, HTML_PARSER, from_encoding='utf-8')
 
         # Remove all image-related elements
         images_removed = 0
@@ -2582,7 +2699,7 @@ class FileBlinder:
         for element in soup.find_all(style=True):
             style = element.get('style', '')
             if 'background-image' in style.lower():
-                style = re.sub(r'background-image\s*:[^;]*;?', '', style, flags=re.IGNORECASE)
+                style = BACKGROUND_IMAGE_CSS.sub('', style)
                 element['style'] = style
                 images_removed += 1
 
@@ -2591,7 +2708,7 @@ class FileBlinder:
             if style_tag.string:
                 css_content = style_tag.string
                 if 'background-image' in css_content.lower():
-                    css_content = re.sub(r'background-image\s*:[^;]*;?', '', css_content, flags=re.IGNORECASE)
+                    css_content = BACKGROUND_IMAGE_CSS.sub('', css_content)
                     style_tag.string = css_content
                     images_removed += 1
 
@@ -2604,34 +2721,20 @@ class FileBlinder:
             link.replace_with(link_text)
             hyperlinks_removed += 1
 
-        # Replace keywords in text nodes
+        # Replace keywords in text nodes; find_all(string=True) hands back every string under
+        # body (text, comments, script/style contents) as a list, so replacing them is safe
         text_replacements = 0
-
-        def replace_text_nodes(element):
-            nonlocal text_replacements
-            if element.string:
-                original_text = str(element.string)
-                new_text = self.replace_keywords_in_text(original_text)
-                if new_text != original_text:
-                    element.string.replace_with(new_text)
-                    text_replacements += 1
-            else:
-                for child in list(element.children):
-                    if hasattr(child, 'name') and child.name:  # It's a tag
-                        replace_text_nodes(child)
-                    elif hasattr(child, 'replace_with'):  # It's a text node
-                        original_text = str(child)
-                        new_text = self.replace_keywords_in_text(original_text)
-                        if new_text != original_text:
-                            child.replace_with(new_text)
-                            text_replacements += 1
-
         if soup.body:
-            replace_text_nodes(soup.body)
+            for text_node in soup.body.find_all(string=True):
+                if text_node:
+                    new_text, found = self._replace_keywords_counted(str(text_node))
+                    if found:
+                        text_node.replace_with(new_text)
+                        text_replacements += 1
 
-        # Write the processed HTML
-        with open(output_path, 'w', encoding='utf-8') as file:
-            file.write(str(soup))
+        # Write the processed HTML; encode() serializes straight to UTF-8 bytes
+        with open(output_path, 'wb') as file:
+            file.write(soup.encode('utf-8'))
 
         print(f"✓ Removed {images_removed} images/graphics")
         print(f"✓ Removed {hyperlinks_removed} hyperlinks (text preserved)")
@@ -2641,23 +2744,10 @@ class FileBlinder:
 
     def process_txt_file(self, input_path, output_path):
         """Process plain text file - replace keywords only"""
-        try:
-            with open(input_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-        except UnicodeDecodeError:
-            with open(input_path, 'r', encoding='latin-1') as file:
-                content = file.read()
+        content = self._read_text_file(input_path)
 
-        # Replace keywords
-        processed_content = self.replace_keywords_in_text(content)
-
-        # Count replacements
-        text_replacements = 0
-        for original, replacement in self.keyword_replacements.items():
-            if original.startswith(r'\b') or original.startswith(r'['):
-                text_replacements += len(re.findall(original, content, flags=re.IGNORECASE))
-            else:
-                text_replacements += len(re.findall(re.escape(original), content, flags=re.IGNORECASE))
+        # Replace keywords, counting the substitutions as they are made
+        processed_content, text_replacements = self._replace_and_count(content)
 
         # Write processed content
         with open(output_path, 'w', encoding='utf-8') as file:
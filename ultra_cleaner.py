@@ -16,6 +16,33 @@ import tempfile
 from pathlib import Path
 from xml.etree import ElementTree as ET
 
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W_COLOR = f'{{{W_NS}}}color'
+W_VAL = f'{{{W_NS}}}val'
+
+
+class _TagMatcher(dict):
+    """Case-insensitive substring test of element tags (or attribute names), memoized per qualified name"""
+
+    def __init__(self, *words, exclude=None):
+        super().__init__()
+        self.words = words
+        self.exclude = exclude
+
+    def __missing__(self, tag):
+        # Only the first sighting of each tag pays for the lowercase copy and substring scan
+        tag_lower = str(tag).lower()
+        matched = self[tag] = (any(word in tag_lower for word in self.words)
+                               and not (self.exclude and self.exclude in tag_lower))
+        return matched
+
+
+# Documents reuse a handful of distinct tag and attribute names, so each is lowercased and
+# scanned once instead of once per node; index with element.tag or the attribute name
+COLOR_ATTR_MATCH = _TagMatcher('color', 'fill', 'theme', 'highlight', exclude='grid')
+COLOR_HIGHLIGHT_TAG_MATCH = _TagMatcher('color', 'highlight')
+COLOR_SHD_TAG_MATCH = _TagMatcher('color', 'shd')
+
 
 def ultra_aggressive_docx_cleanup(input_path, output_path):
     """
@@ -32,7 +59,7 @@ def ultra_aggressive_docx_cleanup(input_path, output_path):
             zip_ref.extractall(temp_dir)
 
         namespaces = {
-            'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
+            'w': W_NS,
             'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
             'wp': 'http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing',
             'w14': 'http://schemas.microsoft.com/office/word/2010/wordml',
@@ -79,13 +106,8 @@ def ultra_aggressive_docx_cleanup(input_path, output_path):
             colors_fixed = 0
             for element in root.iter():
                 # Remove ANY color-related attributes (but not table structure attributes)
-                attrs_to_remove = []
-                for attr_name in list(element.attrib.keys()):
-                    attr_lower = attr_name.lower()
-                    # Remove color/fill attributes but preserve table grid attributes
-                    if any(x in attr_lower for x in
-                           ['color', 'fill', 'theme', 'highlight']) and 'grid' not in attr_lower:
-                        attrs_to_remove.append(attr_name)
+                # Remove color/fill attributes but preserve table grid attributes
+                attrs_to_remove = [attr_name for attr_name in element.attrib if COLOR_ATTR_MATCH[attr_name]]
 
                 for attr in attrs_to_remove:
                     del element.attrib[attr]
@@ -95,13 +117,11 @@ def ultra_aggressive_docx_cleanup(input_path, output_path):
             for rPr in root.findall('.//w:rPr', namespaces):
                 # Remove existing color elements
                 for color_elem in list(rPr):
-                    if 'color' in str(color_elem.tag).lower() or 'highlight' in str(color_elem.tag).lower():
+                    if COLOR_HIGHLIGHT_TAG_MATCH[color_elem.tag]:
                         rPr.remove(color_elem)
 
                 # Add black color
-                color_elem = ET.Element('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}color')
-                color_elem.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val', '000000')
-                rPr.insert(0, color_elem)
+                rPr.insert(0, ET.Element(W_COLOR, {W_VAL: '000000'}))
                 colors_fixed += 1
 
             print(f"   ✓ Fixed {colors_fixed} color-related elements")
@@ -134,7 +154,7 @@ def ultra_aggressive_docx_cleanup(input_path, output_path):
             styles_reset = 0
             for pStyle in root.findall('.//w:pStyle', namespaces):
                 # Reset to Normal style
-                pStyle.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}val', 'Normal')
+                pStyle.set(W_VAL, 'Normal')
                 styles_reset += 1
             print(f"   ✓ Reset {styles_reset} paragraph styles")
 
@@ -147,17 +167,16 @@ def ultra_aggressive_docx_cleanup(input_path, output_path):
         if styles_xml.exists():
             tree = ET.parse(styles_xml)
             root = tree.getroot()
-            parent_map = {c: p for p in tree.iter() for c in p}
 
-            # Remove ALL color and shading elements from styles
-            for element in root.iter():
-                if 'color' in str(element.tag).lower() or 'shd' in str(element.tag).lower():
-                    parent = parent_map.get(element)
-                    if parent is not None:
-                        try:
-                            parent.remove(element)
-                        except:
-                            pass
+            # Remove ALL color and shading elements from styles; they are collected with their
+            # parents first, since removing while iterating would skip the next sibling
+            to_remove = [(parent, element) for parent in root.iter() for element in parent
+                         if COLOR_SHD_TAG_MATCH[element.tag]]
+            for parent, element in to_remove:
+                try:
+                    parent.remove(element)
+                except ValueError:
+                    pass
 
             tree.write(styles_xml, encoding='utf-8', xml_declaration=True)
             print("   ✓ Neutralized styles.xml")
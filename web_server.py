@@ -282,7 +282,7 @@ def preview_file():
             try:
                 os.unlink(input_path)
                 os.unlink(output_path)
-            except:
+            except OSError:
                 pass
 
     except Exception as e:
@@ -2644,7 +2644,7 @@ def process_file():
             # Clean up input file immediately
             try:
                 os.unlink(input_path)
-            except:
+            except OSError:
                 pass
 
     except Exception as e:
@@ -2689,7 +2689,7 @@ def extract_images():
         finally:
             try:
                 os.unlink(temp_path)
-            except:
+            except OSError:
                 pass
 
     except Exception as e: